@@ -1,2 +0,0 @@
-# __init__.py
-# (empty)
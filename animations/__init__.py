@@ -1,2 +1,3 @@
 # __init__.py
 from .animation import Animation
+from .frame_cache import FrameCache, frame_cache
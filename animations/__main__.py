@@ -0,0 +1,8 @@
+# python -m animations [OUT]: builds the frame bundle
+import sys
+from pathlib import Path
+from .bundle import BUNDLE_PATH, build_bundle
+
+out = Path(sys.argv[1]) if len(sys.argv) > 1 else BUNDLE_PATH
+names = build_bundle(out_path=out)
+print(f"Bundled {len(names)} animations into {out}: {', '.join(names)}")
@@ -1,68 +1,129 @@
-import importlib.resources as r
 import curses
-import time
 import threading
+from render import compositor, profiler
+from .frame_cache import frame_cache
+
+# A frame drawn later than this fraction of its period counts as late
+LATE_TOLERANCE = 0.25
 
 
 class Animation:
-    def __init__(self, package: str, window: curses.window, color_pairs = {'default': None}):
+    def __init__(self, package: str, window: curses.window, color_pairs = {'default': None}, fps = 5):
         self.name = package
         self.frames = self._load_frames('animations.' + package)
         self.window = window
         self.stop_event = threading.Event()
         self.color_pairs = color_pairs
+        self.spans, self.deltas = frame_cache.get_spans('animations.' + package, color_pairs)
+        self._repaint = True
+        self._drawn_size = None
+        self.fps = fps
+        self.frame_delay = 1 / fps
+        self.frame_index = 0
+        self.next_frame = None
+        # Playback stats
+        self.drawn_frames = 0
+        self.dropped_frames = 0
+        self.late_frames = 0
         
 
     def _load_frames(self, package: str):
         """
-        loads all string-frames from animation directory
+        loads all frames from animation directory as lists of lines,
+        through the shared frame cache
         
         :param package: name of animation package
         :type package: str
         """
-        pkg = r.files(package)
-        return [f.read_text() for f in sorted(pkg.iterdir()) if f.name.endswith(".txt")]
+        return frame_cache.get(package)
     
     def start(self):
         """
-        Starts the thread playing the animation
+        Hands the animation over to the compositor, which plays it
         """
-        animation_thread = threading.Thread(target=self._play_animation, args=())
-        animation_thread.daemon = True
-        animation_thread.start()
+        self.stop_event.clear()
+        compositor.add(self)
         return self
     
     def stop(self):
         """
-        Updates stop event to kill thread
+        Updates stop event and removes the animation from the compositor
         """
         self.stop_event.set()
+        compositor.remove(self)
+
+    def invalidate(self):
+        """
+        Forces the next frame to be fully repainted, after the window
+        was cleared or resized
+        """
+        self._repaint = True
     
-    def _play_animation(self, frame_delay = 0.2):
+    def tick(self, now):
         """
-        Displays animation line by line
+        Called by the compositor every frame. Draws the next frame once its
+        deadline has passed, skipping the frames whose deadlines were
+        missed entirely so playback keeps its pace.
 
-        :param frame_delay: speed of animation playing
+        :param now: monotonic time of the compositor frame
+        :return: True if a frame was drawn
         """
-        frame_index = 0
-        while not self.stop_event.is_set():
-            self.window.erase()
-            frame_lines = self.frames[frame_index].split('\n')
-            win_height, win_width = self.window.getmaxyx()
+        if self.stop_event.is_set():
+            return False
+        if self.next_frame is None:
+            self.next_frame = now
+        if now < self.next_frame:
+            return False
+
+        behind = now - self.next_frame
+        missed = int(behind // self.frame_delay)
+        if missed:
+            self.dropped_frames += missed
+            self.frame_index = (self.frame_index + missed) % len(self.frames)
+            self.invalidate()  # deltas only apply to the previous frame
+        elif behind > self.frame_delay * LATE_TOLERANCE:
+            self.late_frames += 1
+
+        with profiler.phase('anim.frame'):
+            self._play_animation()
+        self.drawn_frames += 1
+        self.next_frame += (missed + 1) * self.frame_delay
+        return True
 
-            for i, line in enumerate(frame_lines):
-                if i >= win_height - 1:
-                    break
+    def stats(self):
+        """Playback counters of the animation"""
+        return {
+            'fps': self.fps,
+            'drawn': self.drawn_frames,
+            'dropped': self.dropped_frames,
+            'late': self.late_frames,
+        }
 
-                x = 0
-                while x < len(line):
-                    #if self.color_pairs and x in self.color_pairs.keys():
-                    if line[x] in self.color_pairs.keys():
-                        self.window.addstr(i, x, line[x], self.color_pairs[line[x]])
-                    else: self.window.addstr(i, x, line[x], self.color_pairs['default'])
-                    x += 1
+    def _play_animation(self):
+        """
+        Displays the current frame, only redrawing the cells that changed
+        since the previous one, and moves on to the next frame
+        """
+        self._draw_frame(self.frame_index)
+        self.window.noutrefresh()
+        self.frame_index = (self.frame_index + 1) % len(self.frames)
+
+    def _draw_frame(self, frame_index):
+        """
+        Draws a frame fully after a resize or invalidate, otherwise only
+        its delta against the previous frame
+        """
+        win_height, win_width = self.window.getmaxyx()
+        if self._repaint or self._drawn_size != (win_height, win_width):
+            self.window.erase()
+            spans = self.spans[frame_index]
+            self._repaint = False
+            self._drawn_size = (win_height, win_width)
+        else:
+            spans = self.deltas[frame_index]
 
-            self.window.noutrefresh()  # Changed from refresh()
-            curses.doupdate()  
-            frame_index = (frame_index + 1) % len(self.frames)
-            time.sleep(frame_delay)
+        for y, x, text, attr in spans:
+            if y >= win_height - 1:
+                break
+            if x < win_width:
+                self.window.addstr(y, x, text[:win_width - x], attr)
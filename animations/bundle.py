@@ -0,0 +1,202 @@
+"""
+Packs every animation directory into a single binary bundle, so the game
+memory-maps one file instead of reading every NN.txt frame.
+
+Build it with: python -m animations
+
+Layout (little endian):
+    header       magic, version, animation count
+    index        per animation: name, colour map (JSON), frame table
+                 offset, frame count, span table offset
+    frame table  per frame: offset and length of its UTF-8 text
+    span table   per frame: offset of its full span list and of its delta
+                 span list
+    span list    span count, then per span: y, x, colour pair id, text
+                 length and the UTF-8 text
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from .spans import compile_frame, diff_frame
+
+MAGIC = b'TMGA'
+BUNDLE_VERSION = 1
+BUNDLE_PATH = Path(__file__).resolve().parent / 'frames.bundle'
+
+# Colours used by commands missing from colors.json, same as the palette's
+DEFAULT_COLOR_MAP = {'default': 11}
+
+HEADER = struct.Struct('<4sHH')
+NAME = struct.Struct('<H')
+INDEX = struct.Struct('<IHI')
+FRAME = struct.Struct('<II')
+SPAN_LISTS = struct.Struct('<II')
+COUNT = struct.Struct('<I')
+SPAN = struct.Struct('<HHHH')
+
+
+class AssetBundle:
+    """Read-only, memory-mapped view of a frame bundle."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self._index = {}
+
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != BUNDLE_VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {BUNDLE_VERSION} frame bundle")
+
+        pos = HEADER.size
+        for _ in range(count):
+            name, pos = self._read_str(pos)
+            color_map, pos = self._read_str(pos)
+            frame_table, frame_count, span_table = INDEX.unpack_from(self._map, pos)
+            pos += INDEX.size
+            self._index[name] = (json.loads(color_map), frame_table, frame_count, span_table)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+    def color_map(self, name):
+        """Mapping of characters to colour pair ids the spans were built with"""
+        return self._index[name][0]
+
+    def frame_count(self, name):
+        return self._index[name][2]
+
+    def frame_bytes(self, name, frame_index):
+        """Zero-copy slice of the UTF-8 text of one frame"""
+        _, frame_table, _, _ = self._index[name]
+        offset, length = FRAME.unpack_from(self._map, frame_table + frame_index * FRAME.size)
+        return self._view[offset:offset + length]
+
+    def frames(self, name):
+        """Frames of an animation as lists of lines"""
+        return [str(self.frame_bytes(name, i), 'utf-8').split('\n')
+                for i in range(self.frame_count(name))]
+
+    def spans(self, name):
+        """
+        Precomputed (spans, deltas) of an animation, with colour pair ids
+        in place of curses attributes
+        """
+        _, _, frame_count, span_table = self._index[name]
+        spans, deltas = [], []
+        for i in range(frame_count):
+            full, delta = SPAN_LISTS.unpack_from(self._map, span_table + i * SPAN_LISTS.size)
+            spans.append(self._read_spans(full))
+            deltas.append(self._read_spans(delta))
+        return spans, deltas
+
+    def _read_spans(self, pos):
+        count, = COUNT.unpack_from(self._map, pos)
+        pos += COUNT.size
+        spans = []
+        for _ in range(count):
+            y, x, pair_id, length = SPAN.unpack_from(self._map, pos)
+            pos += SPAN.size
+            spans.append((y, x, str(self._view[pos:pos + length], 'utf-8'), pair_id))
+            pos += length
+        return spans
+
+    def _read_str(self, pos):
+        length, = NAME.unpack_from(self._map, pos)
+        pos += NAME.size
+        return str(self._view[pos:pos + length], 'utf-8'), pos + length
+
+
+def load_bundle(path=BUNDLE_PATH):
+    """
+    Opens the frame bundle, or returns None so that loose frame files are
+    used instead (e.g. during development, before the bundle is built)
+    """
+    try:
+        return AssetBundle(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+# ------------------- BUILD ------------------- #
+def build_bundle(src_dir=None, out_path=BUNDLE_PATH, color_maps=None):
+    """
+    Packs every animation directory of src_dir into a bundle at out_path
+
+    :param src_dir: directory holding one sub-directory of NN.txt frames per animation
+    :param out_path: where to write the bundle
+    :param color_maps: mapping of animation name to character -> colour pair id,
+        defaults to the commands section of colors.json
+    :return: names of the bundled animations
+    """
+    if src_dir is None:
+        src_dir = Path(__file__).resolve().parent
+    if color_maps is None:
+        from configs.config_loader import config
+        color_maps = config.colors['commands']
+
+    animations = []
+    for directory in sorted(Path(src_dir).iterdir()):
+        files = sorted(f for f in directory.glob('*.txt')) if directory.is_dir() else []
+        if files:
+            frames = [f.read_text().split('\n') for f in files]
+            animations.append((directory.name, frames, color_maps.get(directory.name, DEFAULT_COLOR_MAP)))
+
+    index = bytearray()
+    for name, frames, color_map in animations:
+        index += _pack_str(name) + _pack_str(json.dumps(color_map)) + INDEX.pack(0, 0, 0)
+
+    data = bytearray(HEADER.pack(MAGIC, BUNDLE_VERSION, len(animations)) + index)
+    pos = HEADER.size
+    for name, frames, color_map in animations:
+        pos += len(_pack_str(name)) + len(_pack_str(json.dumps(color_map)))
+
+        frame_table = len(data)
+        data += bytes(FRAME.size * len(frames))
+        for i, lines in enumerate(frames):
+            text = '\n'.join(lines).encode('utf-8')
+            FRAME.pack_into(data, frame_table + i * FRAME.size, len(data), len(text))
+            data += text
+
+        span_table = len(data)
+        data += bytes(SPAN_LISTS.size * len(frames))
+        for i, lines in enumerate(frames):
+            full = len(data)
+            data += _pack_spans(compile_frame(lines, color_map))
+            delta = len(data)
+            data += _pack_spans(diff_frame(frames[i - 1], lines, color_map))
+            SPAN_LISTS.pack_into(data, span_table + i * SPAN_LISTS.size, full, delta)
+
+        INDEX.pack_into(data, pos, frame_table, len(frames), span_table)
+        pos += INDEX.size
+
+    out_path = Path(out_path)
+    tmp_path = out_path.with_suffix('.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, out_path)
+    return [name for name, _, _ in animations]
+
+
+def _pack_str(text):
+    encoded = text.encode('utf-8')
+    return NAME.pack(len(encoded)) + encoded
+
+
+def _pack_spans(spans):
+    packed = bytearray(COUNT.pack(len(spans)))
+    for y, x, text, pair_id in spans:
+        encoded = text.encode('utf-8')
+        packed += SPAN.pack(y, x, pair_id, len(encoded)) + encoded
+    return packed
+
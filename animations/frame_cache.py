@@ -0,0 +1,162 @@
+import importlib.resources as r
+import threading
+from collections import OrderedDict
+from .bundle import load_bundle
+from .spans import compile_frame, diff_frame, color_key
+
+# Max bytes of frame text kept in memory before old animations are evicted
+FRAME_CACHE_BUDGET = 512 * 1024
+
+
+class FrameCache:
+    """
+    Process-wide cache of pre-split animation frames, keyed by package.
+    Frames come from the memory-mapped bundle when it holds the package,
+    otherwise from the loose NN.txt files.
+    """
+
+    def __init__(self, max_bytes: int = FRAME_CACHE_BUDGET, bundle=None):
+        self.max_bytes = max_bytes
+        self.bundle = bundle
+        self.size = 0
+        self._entries = OrderedDict()  # package -> (mtimes, frames, size, spans)
+        self._lock = threading.Lock()
+
+    def get(self, package: str):
+        """
+        Returns the frames of a package as lists of lines, reloading them
+        from disk only when a frame file was added, removed or modified
+
+        :param package: dotted name of animation package
+        :type package: str
+        """
+        name = self._bundled_name(package)
+        if name:
+            # The bundle is immutable once mapped, so there is nothing to stat
+            files, mtimes = None, ('bundle', name)
+        else:
+            files = self._frame_files(package)
+            mtimes = tuple((f.name, _mtime(f)) for f in files)
+
+        with self._lock:
+            entry = self._entries.get(package)
+            if entry and entry[0] == mtimes:
+                self._entries.move_to_end(package)
+                return entry[1]
+        return self._load(package, files, mtimes)[1]
+
+    def get_spans(self, package: str, color_pairs: dict):
+        """
+        Returns the frames of a package compiled into (y, x, text, attr)
+        spans for the given colour mapping, compiling them once per mapping.
+        Gives a (spans, deltas) pair, where deltas[i] only holds the cells
+        that change from frame i-1 (wrapping around) to frame i
+
+        :param package: dotted name of animation package
+        :type package: str
+        :param color_pairs: mapping of characters to curses attributes
+        """
+        frames = self.get(package)
+        key = color_key(color_pairs)
+        with self._lock:
+            entry = self._entries.get(package)
+            spans = entry[3].get(key) if entry and entry[1] is frames else None
+        if spans is not None:
+            return spans
+        spans = self._bundled_spans(package, color_pairs)
+        if spans is None:
+            spans = (
+                [compile_frame(lines, color_pairs) for lines in frames],
+                [diff_frame(frames[i - 1], frames[i], color_pairs) for i in range(len(frames))],
+            )
+        # Spans decoded from the bundle are kept too, so they are read from the mmap once
+        with self._lock:
+            entry = self._entries.get(package)
+            if entry and entry[1] is frames:
+                entry[3][key] = spans
+        return spans
+
+    def _load(self, package, files, mtimes):
+        """Reads the frames of a package and stores them"""
+        if files is None:
+            frames = self.bundle.frames(self._bundled_name(package))
+        else:
+            frames = [f.read_text().split('\n') for f in files]
+        size = sum(len(line) for lines in frames for line in lines)
+
+        with self._lock:
+            if package in self._entries:
+                self.size -= self._entries.pop(package)[2]
+            entry = (mtimes, frames, size, {})
+            self._entries[package] = entry
+            self.size += size
+            self._evict()
+        return entry
+
+    def invalidate(self, package: str = None):
+        """Drops one package from the cache, or all of them"""
+        with self._lock:
+            if package is None:
+                self._entries.clear()
+                self.size = 0
+            elif package in self._entries:
+                self.size -= self._entries.pop(package)[2]
+
+    def _evict(self):
+        """Drops least recently used packages until back under budget"""
+        # The newest entry always stays, even when it is over budget alone
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, size, _) = self._entries.popitem(last=False)
+            self.size -= size
+
+    def _bundled_name(self, package):
+        """Name of the package inside the bundle, or None if it is not bundled"""
+        prefix, _, name = package.rpartition('.')
+        if self.bundle is not None and prefix == 'animations' and name in self.bundle:
+            return name
+        return None
+
+    def _bundled_spans(self, package, color_pairs):
+        """
+        Precomputed spans of a bundled package, with their colour pair ids
+        swapped for the given attributes. Returns None when the bundle was
+        built with a different colour mapping.
+        """
+        name = self._bundled_name(package)
+        if not name:
+            return None
+        color_map = self.bundle.color_map(name)
+        if color_map.keys() != color_pairs.keys():
+            return None
+        attrs = {}
+        for char, pair_id in color_map.items():
+            if attrs.setdefault(pair_id, color_pairs[char]) != color_pairs[char]:
+                return None
+
+        spans, deltas = self.bundle.spans(name)
+        return (
+            [[(y, x, text, attrs[pair_id]) for y, x, text, pair_id in frame] for frame in spans],
+            [[(y, x, text, attrs[pair_id]) for y, x, text, pair_id in frame] for frame in deltas],
+        )
+
+    def _frame_files(self, package: str):
+        pkg = r.files(package)
+        return [f for f in sorted(pkg.iterdir(), key=lambda f: f.name) if f.name.endswith(".txt")]
+
+    def __contains__(self, package):
+        return package in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _mtime(f):
+    """Modification time of a resource, or None if it has no stat"""
+    try:
+        return f.stat().st_mtime_ns
+    except AttributeError:
+        return None
+
+
+# Global instance shared by every Animation
+frame_cache = FrameCache(bundle=load_bundle())
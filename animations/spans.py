@@ -0,0 +1,87 @@
+def compile_frame(lines, color_pairs):
+    """
+    Compiles a frame into runs of same-attribute text, so that it can be
+    drawn with one addstr per run instead of one per character
+
+    :param lines: frame as a list of lines
+    :param color_pairs: mapping of characters to curses attributes, with a 'default' entry
+    :return: list of (y, x, text, attr) spans
+    """
+    default = color_pairs.get('default')
+    # Unmapped blanks look the same under any colour, so they can join any run
+    blank_is_free = ' ' not in color_pairs
+    spans = []
+
+    for y, line in enumerate(lines):
+        start, attr = None, None
+        for x, ch in enumerate(line):
+            if ch == ' ' and blank_is_free:
+                continue
+            ch_attr = color_pairs.get(ch, default)
+            if start is not None and ch_attr != attr:
+                spans.append((y, start, line[start:_run_end(line, x, blank_is_free)], attr))
+                start = None
+            if start is None:
+                start, attr = x, ch_attr
+        if start is not None:
+            spans.append((y, start, line[start:_run_end(line, len(line), blank_is_free)], attr))
+    return spans
+
+
+def _run_end(line, end, blank_is_free):
+    """Drops free trailing blanks from the run ending at end"""
+    if blank_is_free:
+        while end > 0 and line[end - 1] == ' ':
+            end -= 1
+    return end
+
+
+def color_key(color_pairs):
+    """Hashable key of a colour mapping, used to cache compiled spans"""
+    return tuple(sorted(color_pairs.items(), key=lambda item: item[0]))
+
+
+def diff_frame(prev_lines, lines, color_pairs, gap=3):
+    """
+    Compiles only the cells that changed from prev_lines to lines into
+    (y, x, text, attr) spans. Cleared cells are written back as blanks and
+    runs separated by at most gap unchanged cells are merged into one.
+
+    :param prev_lines: previous frame as a list of lines
+    :param lines: frame as a list of lines
+    :param color_pairs: mapping of characters to curses attributes, with a 'default' entry
+    :param gap: longest stretch of unchanged cells rewritten to save a call
+    :return: list of (y, x, text, attr) spans
+    """
+    default = color_pairs.get('default')
+    blank_is_free = ' ' not in color_pairs
+    spans = []
+
+    for y in range(max(len(prev_lines), len(lines))):
+        old = prev_lines[y] if y < len(prev_lines) else ''
+        new = lines[y] if y < len(lines) else ''
+        width = max(len(old), len(new))
+        old, new = old.ljust(width), new.ljust(width)
+
+        start, end, attr = None, None, None
+        for x in range(width):
+            if old[x] == new[x]:
+                continue
+            ch = new[x]
+            if start is not None and ch == ' ' and blank_is_free:
+                ch_attr = attr
+            else:
+                ch_attr = color_pairs.get(ch, default)
+            if start is not None and not (
+                ch_attr == attr and x - end <= gap
+                and all(c == ' ' and blank_is_free or color_pairs.get(c, default) == attr
+                        for c in new[end:x])
+            ):
+                spans.append((y, start, new[start:end], attr))
+                start = None
+            if start is None:
+                start, attr = x, ch_attr
+            end = x + 1
+        if start is not None:
+            spans.append((y, start, new[start:end], attr))
+    return spans
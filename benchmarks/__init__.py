@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Run a benchmark with: python -m benchmarks.<name>
@@ -0,0 +1,88 @@
+# benchmarks/bench_animation.py
+"""
+Compares per-character frame drawing with the compiled colour spans and
+delta spans used by Animation._play_animation.
+Run with: python -m benchmarks.bench_animation
+"""
+import time
+from animations import frame_cache
+from animations.spans import compile_frame, diff_frame
+
+PACKAGES = ['fire', 'idle', 'sleep', 'dead']
+ROUNDS = 200
+
+
+class CountingWindow:
+    """Stand-in for a curses window that only counts draw calls"""
+    def __init__(self, height=20, width=80):
+        self.height, self.width = height, width
+        self.calls = 0
+        self.cells = 0
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def addstr(self, y, x, text, attr=0):
+        self.calls += 1
+        self.cells += len(text)
+
+
+def draw_per_char(window, lines, color_pairs):
+    """The drawing loop used before spans"""
+    win_height, win_width = window.getmaxyx()
+    for i, line in enumerate(lines):
+        if i >= win_height - 1:
+            break
+        x = 0
+        while x < len(line):
+            if line[x] in color_pairs.keys():
+                window.addstr(i, x, line[x], color_pairs[line[x]])
+            else: window.addstr(i, x, line[x], color_pairs['default'])
+            x += 1
+
+
+def draw_spans(window, spans):
+    win_height, win_width = window.getmaxyx()
+    for y, x, text, attr in spans:
+        if y >= win_height - 1:
+            break
+        if x < win_width:
+            window.addstr(y, x, text[:win_width - x], attr)
+
+
+def bench(package):
+    # Plain ints stand in for curses.color_pair values
+    color_pairs = {'(': 1, ')': 2, '§': 3, '@': 4, 'U': 5, '#': 6, '~': 7, 'default': 8}
+    frames = frame_cache.get('animations.' + package)
+    spans = [compile_frame(lines, color_pairs) for lines in frames]
+    deltas = [diff_frame(frames[i - 1], frames[i], color_pairs) for i in range(len(frames))]
+
+    per_char, compiled, delta = CountingWindow(), CountingWindow(), CountingWindow()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for lines in frames:
+            draw_per_char(per_char, lines, color_pairs)
+    per_char_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for frame_spans in spans:
+            draw_spans(compiled, frame_spans)
+    spans_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for frame_deltas in deltas:
+            draw_spans(delta, frame_deltas)
+    delta_time = time.perf_counter() - start
+
+    n = ROUNDS * len(frames)
+    print(f"{package:>6}: per-char {per_char.calls // n:5d} calls {per_char_time / n * 1e6:7.1f} us/frame | "
+          f"spans {compiled.calls // n:3d} calls {spans_time / n * 1e6:5.1f} us/frame "
+          f"x{per_char_time / spans_time:.1f} | "
+          f"delta {delta.calls // n:3d} calls {delta.cells // n:4d} cells {delta_time / n * 1e6:5.1f} us/frame")
+
+
+if __name__ == "__main__":
+    for package in PACKAGES:
+        bench(package)
@@ -0,0 +1,77 @@
+# benchmarks/bench_fleet.py
+"""
+Ages a population of pets one Pet at a time with Pet.update, and as a
+PetFleet, then times a bulk load and save of the fleet through a
+temporary sqlite store. Needs numpy.
+
+    python -m benchmarks.bench_fleet [--pets 100000]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from tamagotchi import Pet, PetFleet, SqliteStore
+
+PETS = 100_000
+MAX_HOURS = 48
+
+
+def population(count, now, seed=0):
+    rng = random.Random(seed)
+    return [(f'pet{i}', {
+        'health': rng.uniform(1, 15),
+        'fatigue': rng.uniform(0, 10),
+        'sleep': rng.uniform(0, 10),
+        'experience': rng.uniform(0, 100),
+        'resting': rng.random() < 0.3,
+        'save_time': now - rng.uniform(0, MAX_HOURS * 3600),
+    }) for i in range(count)]
+
+
+def age_scalar(pets, now):
+    """Ages every pet as a Pet object, the way loading them one by one does"""
+    for name, properties in pets:
+        pet = Pet.__new__(Pet)
+        pet.name, pet.version = name, 0
+        pet.health, pet.fatigue = properties['health'], properties['fatigue']
+        pet.sleepy, pet.experience = properties['sleep'], properties['experience']
+        pet.resting = properties['resting']
+        pet.last_update = properties['save_time']
+        pet.update(now)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pets', type=int, default=PETS, help="number of pets simulated")
+    args = parser.parse_args(argv)
+
+    now = time.time()
+    pets = population(args.pets, now)
+    scalar, _ = timed(age_scalar, pets, now)
+    build, fleet = timed(PetFleet, pets, now)
+    vector, _ = timed(fleet.age, now + 3600)
+    print(f"{args.pets} pets: Pet objects {scalar * 1000:.1f} ms, "
+          f"PetFleet {vector * 1000:.1f} ms per age() (+{build * 1000:.1f} ms to build), "
+          f"{scalar / vector:.0f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteStore(Path(tmp) / 'fleet.db')
+        try:
+            save, _ = timed(fleet.save, store)
+            load, fleet = timed(PetFleet.from_store, store)
+        finally:
+            store.close()
+    print(f"sqlite store: save {save * 1000:.1f} ms, load {load * 1000:.1f} ms ({len(fleet)} pets)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
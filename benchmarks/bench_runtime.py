@@ -0,0 +1,148 @@
+# benchmarks/bench_runtime.py
+"""
+Compares the threaded and asyncio runtimes of main.py: CPU used while the
+pet idles, and the latency from a key press to its echo in the C:> prompt.
+The game runs in a pseudo-terminal, so this only works on Linux.
+
+    python -m benchmarks.bench_runtime
+"""
+import argparse
+import fcntl
+import os
+import pty
+import select
+import struct
+import sys
+import termios
+import time
+from pathlib import Path
+from tamagotchi import store
+
+ROOT = Path(__file__).resolve().parent.parent
+RUNTIMES = ['threads', 'asyncio']
+PET_NAME = 'Bnch'
+IDLE_SECONDS = 5
+KEYS = 40
+# Letters that appear in neither the idle animation nor the status panel
+ECHO_KEYS = b'zwv'
+TERM_SIZE = (40, 140)
+
+
+class GameProcess:
+    """main.py running in a pseudo-terminal, with its output drained as it comes"""
+
+    def __init__(self, runtime):
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:
+            os.chdir(ROOT)
+            os.environ['TERM'] = 'xterm-256color'
+            os.execvp(sys.executable, [sys.executable, 'main.py', '--runtime', runtime])
+        fcntl.ioctl(self.fd, termios.TIOCSWINSZ, struct.pack('HHHH', *TERM_SIZE, 0, 0))
+
+    def read(self, timeout):
+        """Output received within timeout seconds"""
+        out = b''
+        end = time.monotonic() + timeout
+        while (left := end - time.monotonic()) > 0:
+            ready, _, _ = select.select([self.fd], [], [], left)
+            if not ready:
+                break
+            try:
+                out += os.read(self.fd, 65536)
+            except OSError:
+                break
+        return out
+
+    def wait_for(self, data, timeout=1.0):
+        """Seconds until data shows up in the output, or None"""
+        start = time.monotonic()
+        out = b''
+        while data not in out:
+            left = start + timeout - time.monotonic()
+            ready, _, _ = select.select([self.fd], [], [], max(0.0, left))
+            if not ready:
+                return None
+            out += os.read(self.fd, 65536)
+        return time.monotonic() - start
+
+    def write(self, data):
+        os.write(self.fd, data)
+
+    def cpu_seconds(self):
+        """User and system CPU time of the game so far"""
+        fields = Path(f'/proc/{self.pid}/stat').read_text().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+    def close(self):
+        self.write(b'\x7f' * KEYS)
+        self.read(0.5)
+        self.write(b'quit\r')
+        self.read(2)
+        try:
+            os.kill(self.pid, 9)
+        except ProcessLookupError:
+            pass
+        os.waitpid(self.pid, 0)
+        os.close(self.fd)
+
+
+def bench(runtime, idle_seconds=IDLE_SECONDS, keys=KEYS):
+    game = GameProcess(runtime)
+    try:
+        game.wait_for(b'Which pet', timeout=5)
+        game.write(PET_NAME.encode() + b'\n')
+        game.read(4.5)  # welcome animation
+
+        cpu = game.cpu_seconds()
+        game.read(idle_seconds)
+        cpu = game.cpu_seconds() - cpu
+
+        latencies = []
+        for i in range(keys):
+            key = bytes([ECHO_KEYS[i % len(ECHO_KEYS)]])
+            game.read(0.05)
+            game.write(key)
+            latency = game.wait_for(key)
+            if latency is not None:
+                latencies.append(latency * 1000)
+    finally:
+        game.close()
+
+    latencies.sort()
+    last = len(latencies) - 1
+    return {
+        'idle_cpu_percent': round(cpu / idle_seconds * 100, 2),
+        'latency_p50_ms': round(latencies[last // 2], 2) if latencies else None,
+        'latency_p95_ms': round(latencies[last * 95 // 100], 2) if latencies else None,
+        'latency_max_ms': round(latencies[last], 2) if latencies else None,
+        'keys_echoed': len(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--idle', type=float, default=IDLE_SECONDS, help="seconds of idling measured")
+    parser.add_argument('--keys', type=int, default=KEYS, help="key presses measured")
+    args = parser.parse_args(argv)
+
+    # The save goes through the configured store, whichever backend and file it uses
+    logs = [ROOT / 'saves' / f'history_{PET_NAME}.log', ROOT / 'saves' / f'events_{PET_NAME}.log']
+    # Logs outlive their pet, a dead one still has them, and everything is deleted afterwards
+    if PET_NAME in store.names() or any(path.exists() for path in logs):
+        print(f"A pet named {PET_NAME} already exists or left its logs, not overwriting them")
+        return 1
+    try:
+        for runtime in RUNTIMES:
+            result = bench(runtime, args.idle, args.keys)
+            print(f"{runtime:<8} idle cpu {result['idle_cpu_percent']:6.2f}%   key latency "
+                  f"p50 {result['latency_p50_ms']} ms  p95 {result['latency_p95_ms']} ms  "
+                  f"max {result['latency_max_ms']} ms  ({result['keys_echoed']}/{args.keys} keys)")
+    finally:
+        store.delete(PET_NAME)
+        for path in logs:
+            path.unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
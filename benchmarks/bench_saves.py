@@ -0,0 +1,90 @@
+# benchmarks/bench_saves.py
+"""
+Load and save throughput of the pet stores: one JSON file per pet, one
+binary record per pet, and the sqlite table. Also times reading the old
+JSON saves, whose save_date strings are parsed on every load.
+
+    python -m benchmarks.bench_saves [--pets 2000]
+"""
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from tamagotchi.store import DATE_FORMAT, BinaryStore, JsonStore, SqliteStore
+
+PETS = 2000
+ROUNDS = 3
+
+
+def population(count, seed=0):
+    rng = random.Random(seed)
+    now = time.time()
+    return [(f'pet{i}', {
+        'health': rng.uniform(1, 15),
+        'fatigue': rng.uniform(0, 10),
+        'sleep': rng.uniform(0, 10),
+        'experience': rng.uniform(0, 100),
+        'resting': rng.random() < 0.3,
+        'save_time': now - rng.uniform(0, 48 * 3600),
+    }) for i in range(count)]
+
+
+def write_legacy(directory, pets):
+    """JSON saves as written before save_time, with a save_date string"""
+    for name, properties in pets:
+        properties = dict(properties, save_date=datetime.fromtimestamp(properties['save_time']).strftime(DATE_FORMAT))
+        del properties['save_time']
+        with (directory / f"save_{name}.json").open('w') as f:
+            json.dump({name: {'properties': properties}}, f, indent=4)
+
+
+def best_of(function, rounds=ROUNDS):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench(store, pets, save=True):
+    names = [name for name, _ in pets]
+    saving = best_of(lambda: store.save_many(pets)) if save else None
+    loading = best_of(lambda: [store.load(name) for name in names])
+    return saving, loading
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pets', type=int, default=PETS, help="number of saved pets")
+    args = parser.parse_args(argv)
+
+    pets = population(args.pets)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for kind in ('legacy', 'json', 'binary'):
+            (tmp / kind).mkdir()
+        write_legacy(tmp / 'legacy', pets)
+        results['json (save_date)'] = bench(JsonStore(tmp / 'legacy'), pets, save=False)
+        results['json'] = bench(JsonStore(tmp / 'json'), pets)
+        results['binary'] = bench(BinaryStore(tmp / 'binary'), pets)
+        store = SqliteStore(tmp / 'pets.db')
+        try:
+            results['sqlite'] = bench(store, pets)
+        finally:
+            store.close()
+
+    for kind, (saving, loading) in results.items():
+        save = f"{args.pets / saving:9.0f} saves/s" if saving else " " * 16
+        print(f"{kind:<17} {save}  {args.pets / loading:9.0f} loads/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
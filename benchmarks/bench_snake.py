@@ -0,0 +1,147 @@
+# benchmarks/bench_snake.py
+"""
+Cost of a Snake tick and of placing food as the snake fills the board,
+from the 20x80 game window up to a 1000x1000 board. Compares the
+occupancy set and FreeCells of Snake with the previous deque membership
+test and rejection sampling, which never returns on a full board.
+
+    python -m benchmarks.bench_snake [--quick]
+"""
+import argparse
+import curses
+import random
+import sys
+import time
+from games.game import GameState
+from games.snake_game import Snake
+
+# (height, width) given to Snake, 18x78 is the board of the 20x80 game window
+BOARDS = [(18, 78), (100, 100), (300, 300), (1000, 1000)]
+FILLS = [0.0, 0.5, 0.9, 1.0]
+STEPS = 50
+FOOD_PLACEMENTS = 200
+# Longest a single measurement keeps repeating calls
+TIME_BUDGET = 1.0
+
+
+class LegacySnake(Snake):
+    """Snake before the occupancy set: deque scans and rejection sampling"""
+
+    def update(self):
+        head_y, head_x = self.snake[0]
+        if self.direction == curses.KEY_UP:
+            new_head = (head_y - 1, head_x)
+        elif self.direction == curses.KEY_DOWN:
+            new_head = (head_y + 1, head_x)
+        elif self.direction == curses.KEY_LEFT:
+            new_head = (head_y, head_x - 1)
+        elif self.direction == curses.KEY_RIGHT:
+            new_head = (head_y, head_x + 1)
+
+        y, x = new_head
+        if y <= 0:
+            y = self.height - 2
+        elif y >= self.height - 1:
+            y = 1
+        if x <= 0:
+            x = self.width - 2
+        elif x >= self.width - 1:
+            x = 1
+        new_head = (y, x)
+
+        if new_head in self.snake:
+            self.state = GameState.GAME_OVER
+            return
+        self.snake.appendleft(new_head)
+        if new_head == self.food:
+            self.score += 10
+            self.place_food()
+        else:
+            self.snake.pop()
+
+    def place_food(self):
+        while True:
+            y = random.randint(1, self.height-4)
+            x = random.randint(1, self.width-4)
+            if (y, x) not in self.snake:
+                self.food = (y, x)
+                break
+
+
+def lay_snake(snake, fill):
+    """
+    Replaces the snake by one winding through the food cells below row 1,
+    covering up to a fill fraction of them, with its head at the start of
+    the empty row 1 and heading right along it
+
+    :return: fraction of the food cells the snake covers
+    """
+    rows, cols = snake.height - 4, snake.width - 4
+    length = min(int(rows * cols * fill), (rows - 1) * cols)
+    body = []
+    for i in range(length):
+        row, col = divmod(i, cols)
+        body.append((2 + row, cols - col if row % 2 == 0 else 1 + col))
+    cells = [(1, 1)] + body
+    snake.snake.clear()
+    snake.snake.extend(cells)
+    snake.occupied = set(cells)
+    snake.free.__init__((y, x) for y in range(1, rows + 1) for x in range(1, cols + 1) if (y, x) not in snake.occupied)
+    snake.direction = curses.KEY_RIGHT
+    snake.food = None
+    return len(cells) / (rows * cols)
+
+
+def time_per_call(function, calls):
+    """Microseconds per call, over at most calls calls and TIME_BUDGET seconds"""
+    start = time.perf_counter()
+    done = 0
+    while done < calls:
+        function()
+        done += 1
+        if time.perf_counter() - start > TIME_BUDGET:
+            break
+    return (time.perf_counter() - start) / done * 1e6
+
+
+def bench(cls, height, width, fill):
+    snake = cls(height, width)
+    covered = lay_snake(snake, fill)
+    # Stay on the empty row, away from the wrap around
+    update = time_per_call(snake.update, min(STEPS, width - 4))
+    if snake.state != GameState.PLAYING:
+        raise RuntimeError("the benchmark snake collided")
+    place = time_per_call(snake.place_food, FOOD_PLACEMENTS)
+    return covered, update, place
+
+
+def bench_full_board(height=18, width=78):
+    """Microseconds until place_food finds out the board is full"""
+    snake = Snake(height, width)
+    snake.occupied.update(snake.free.cells)
+    snake.free.__init__()
+    start = time.perf_counter()
+    snake.place_food()
+    return (time.perf_counter() - start) * 1e6, snake.state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quick', action='store_true', help="skip the 1000x1000 board")
+    args = parser.parse_args(argv)
+
+    boards = BOARDS[:-1] if args.quick else BOARDS
+    print(f"{'board':>10} {'fill':>7}   {'tick us: sets':>13} {'legacy':>10}   {'food us: sets':>13} {'legacy':>10}")
+    for height, width in boards:
+        for fill in FILLS:
+            covered, update, place = bench(Snake, height, width, fill)
+            _, legacy_update, legacy_place = bench(LegacySnake, height, width, fill)
+            print(f"{height:>4}x{width:<5} {covered:7.1%}   {update:13.2f} {legacy_update:10.2f}   "
+                  f"{place:13.2f} {legacy_place:10.2f}")
+    elapsed, state = bench_full_board()
+    print(f"full {BOARDS[0][0]}x{BOARDS[0][1]} board: place_food ends the game ({state.name}) in {elapsed:.2f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# benchmarks/bench_space.py
+"""
+Cost of a MiniSpaceInvaders tick on enlarged boards with more enemies,
+bunkers and bullets in flight, with the cell grids of the game and with
+the previous scans over every bunker and enemy for each bullet, and of
+laying out a formation. The enemies are an ArrayFormation (numpy) or a
+Formation (lists), the legacy game keeps one dict per enemy.
+
+    python -m benchmarks.bench_space
+"""
+import argparse
+import random
+import sys
+import time
+from games import formation
+from games.game import GameState
+from games.space_invaders_game import MiniSpaceInvaders
+
+# (board height, board width, enemy rows, enemy columns, bullets of each side in flight)
+SCENARIOS = [
+    (18, 78, 4, 8, 3),
+    (60, 200, 10, 60, 20),
+    (150, 600, 30, 190, 50),
+    (300, 1500, 60, 490, 100),
+]
+TICKS = 100
+# Longest a single measurement keeps ticking
+TIME_BUDGET = 2.0
+
+
+class ListInvaders(MiniSpaceInvaders):
+    """MiniSpaceInvaders with the plain Python Formation, as without numpy"""
+
+    def create_formation(self, rows, cols, left, spacing, level):
+        self.formation = formation.Formation(rows, cols, left, spacing, level)
+
+
+class LegacyInvaders(MiniSpaceInvaders):
+    """
+    MiniSpaceInvaders before the cell grids: the bunkers and enemies are
+    scanned for every bullet, and the enemies moved one by one
+    """
+
+    def create_formation(self, rows, cols, left, spacing, level):
+        self.enemies = []
+        for row in range(rows):
+            for col in range(cols):
+                enemy_type = min(row, 2)
+                self.enemies.append({'x': left + col * spacing, 'y': 2 + row * 2, 'alive': True,
+                                     'type': enemy_type, 'points': (3 - enemy_type) * level})
+
+    def update(self):
+        bunkers = list(self.bunkers.values())
+        enemies = self.enemies
+        current_time = self.time
+
+        bullets_to_remove = []
+        for i, (y, x) in enumerate(self.bullets):
+            for bunker in bunkers[:]:
+                if bunker['x'] == x and bunker['y'] == y:
+                    bunker['health'] -= 1
+                    if bunker['health'] <= 0:
+                        bunkers.remove(bunker)
+                    bullets_to_remove.append(i)
+                    break
+            else:
+                new_y = y - self.bullet_speed
+                if new_y > 0:
+                    self.bullets[i] = (new_y, x)
+                else:
+                    bullets_to_remove.append(i)
+        for idx in sorted(bullets_to_remove, reverse=True):
+            self.bullets.pop(idx)
+
+        if current_time - self.last_enemy_move >= self.enemy_speed:
+            self.last_enemy_move = current_time
+            change_direction = False
+            for enemy in enemies:
+                if enemy['alive']:
+                    if (enemy['x'] <= 1 and self.enemy_direction == -1) or \
+                       (enemy['x'] >= self.width - 2 and self.enemy_direction == 1):
+                        change_direction = True
+                        break
+            if change_direction:
+                self.enemy_direction *= -1
+                for enemy in enemies:
+                    if enemy['alive']:
+                        enemy['y'] += 1
+            else:
+                for enemy in enemies:
+                    if enemy['alive']:
+                        enemy['x'] += self.enemy_direction
+
+        alive_enemies = [e for e in enemies if e['alive']]
+        if alive_enemies and random.random() < self.enemy_shoot_chance:
+            shooter = random.choice(alive_enemies)
+            self.enemy_bullets.append((shooter['y'] + 1, shooter['x']))
+
+        enemy_bullets_to_remove = []
+        for i, (y, x) in enumerate(self.enemy_bullets):
+            for bunker in bunkers[:]:
+                if bunker['x'] == x and bunker['y'] == y:
+                    bunker['health'] -= 1
+                    if bunker['health'] <= 0:
+                        bunkers.remove(bunker)
+                    enemy_bullets_to_remove.append(i)
+                    break
+            else:
+                new_y = y + 1
+                if new_y < self.height:
+                    self.enemy_bullets[i] = (new_y, x)
+                else:
+                    enemy_bullets_to_remove.append(i)
+        for idx in sorted(enemy_bullets_to_remove, reverse=True):
+            self.enemy_bullets.pop(idx)
+
+        self.legacy_collisions(enemies)
+        self.bunkers = {(b['y'], b['x']): b for b in bunkers}
+        if not any(e['alive'] for e in enemies):
+            self.state = GameState.WIN
+
+    def legacy_collisions(self, enemies):
+        bullets_to_remove = []
+        for bullet_idx, (by, bx) in enumerate(self.bullets):
+            for enemy in enemies:
+                if enemy['alive'] and abs(enemy['x'] - bx) <= 1 and abs(enemy['y'] - by) <= 1:
+                    enemy['alive'] = False
+                    bullets_to_remove.append(bullet_idx)
+                    self.score += enemy['points']
+                    break
+        for idx in sorted(bullets_to_remove, reverse=True):
+            self.bullets.pop(idx)
+        for bullet in self.enemy_bullets[:]:
+            if abs(bullet[1] - self.player_x) <= 2 and abs(bullet[0] - self.player_y) <= 1:
+                self.enemy_bullets.remove(bullet)
+
+
+def setup(cls, height, width, rows, cols):
+    random.seed(0)
+    game = cls(height, width)
+    game.create_formation(rows, cols, left=2, spacing=3, level=1)
+    game.enemy_speed = 0.1
+    game.enemy_shoot_chance = 1.0
+    # A wall of bunkers across the board, over the ones of the level
+    for x in range(1, width - 1):
+        for y in range(height - 12, height - 9):
+            game.bunkers[(y, x)] = {'x': x, 'y': y, 'health': 3}
+    return game
+
+
+def top_up(game, bullets, rng):
+    """Keeps bullets of each side in flight, from random columns"""
+    while len(game.bullets) < bullets:
+        game.bullets.append((game.height - 4, rng.randrange(2, game.width - 2)))
+    while len(game.enemy_bullets) < bullets:
+        game.enemy_bullets.append((rng.randrange(2, game.height // 2), rng.randrange(2, game.width - 2)))
+
+
+def bench(cls, height, width, rows, cols, bullets):
+    game = setup(cls, height, width, rows, cols)
+    rng = random.Random(1)
+    elapsed, ticks = 0.0, 0
+    while ticks < TICKS and elapsed < TIME_BUDGET and game.state == GameState.PLAYING:
+        top_up(game, bullets, rng)
+        game.time += 0.05
+        start = time.perf_counter()
+        game.update()
+        elapsed += time.perf_counter() - start
+        ticks += 1
+    return elapsed / max(ticks, 1) * 1e6
+
+
+def bench_layout(cls, height, width, rows, cols):
+    """Microseconds to lay out a formation, as each level does"""
+    game = cls(height, width)
+    start = time.perf_counter()
+    game.create_formation(rows, cols, left=2, spacing=3, level=1)
+    return (time.perf_counter() - start) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args(argv)
+
+    games = [('lists', ListInvaders), ('legacy', LegacyInvaders)]
+    if formation.np is not None:
+        games.insert(0, ('arrays', MiniSpaceInvaders))
+    else:
+        print("numpy is not installed, skipping ArrayFormation")
+    header = ' '.join(f"{label:>10}" for label, _ in games)
+    print(f"{'board':>10} {'enemies':>8} {'bunkers':>8} {'bullets':>8}   tick us: {header}   layout us: {header}")
+    for height, width, rows, cols, bullets in SCENARIOS:
+        ticks = ' '.join(f"{bench(cls, height, width, rows, cols, bullets):10.1f}" for _, cls in games)
+        layouts = ' '.join(f"{bench_layout(cls, height, width, rows, cols):10.1f}" for _, cls in games)
+        bunkers = len(setup(MiniSpaceInvaders, height, width, rows, cols).bunkers)
+        print(f"{height:>4}x{width:<5} {rows * cols:>8} {bunkers:>8} {2 * bullets:>8}   "
+              f"         {ticks}              {layouts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
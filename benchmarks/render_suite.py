@@ -0,0 +1,208 @@
+# benchmarks/render_suite.py
+"""
+Benchmarks the render hot paths on the headless backend and compares them
+against a stored baseline, failing when one gets slower than allowed.
+Timings are compared relative to a calibration loop timed in the same run,
+so a baseline recorded on one machine still holds on a slower one. Each
+benchmark keeps the median of several timings, and one over tolerance is
+timed again before it counts as a regression.
+
+    python -m benchmarks.render_suite                    # run and compare
+    python -m benchmarks.render_suite --update-baseline  # store new baseline
+"""
+import argparse
+import importlib.resources as r
+import json
+import sys
+import time
+from pathlib import Path
+
+from render import HeadlessScreen, install_acs
+from animations import Animation
+from games import SnakeGame, MiniSpaceInvadersGame
+from tamagotchi import Pet
+from utils import display_pet, draw_legend
+
+BENCH_DIR = Path(__file__).resolve().parent
+BASELINE_PATH = BENCH_DIR / 'render_baseline.json'
+RESULTS_PATH = BENCH_DIR / 'render_results.json'
+
+# A benchmark fails when it is this much slower than its baseline
+TOLERANCE = 0.5
+SNAKE_LENGTHS = [1, 50, 200, 800]
+MIN_TIME = 0.1
+REPEATS = 3
+# Timings of each benchmark, the median one is kept
+RUNS = 3
+# Times a benchmark over tolerance is timed again, it only regressed if it stays over every time
+RETRIES = 2
+
+
+def measure(fn, min_time=MIN_TIME, repeats=REPEATS):
+    """
+    Times fn, returning the best microseconds per call over several
+    repeats of at least min_time seconds each
+    """
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        if time.perf_counter() - start >= min_time / 20:
+            break
+        calls *= 2
+
+    best = float('inf')
+    for _ in range(repeats):
+        n, start = 0, time.perf_counter()
+        while True:
+            for _ in range(calls):
+                fn()
+            n += calls
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / n)
+    return best * 1e6
+
+
+def calibrate():
+    """
+    Microseconds per call of a fixed pure Python workload, laying out and
+    joining a board of characters, that every result is divided by
+    """
+    def work():
+        cells = [(y, x) for y in range(20) for x in range(80)]
+        return ''.join(chr(33 + (y * x) % 90) for y, x in cells)
+    return measure(work)
+
+
+def time_case(fn, runs=RUNS):
+    """
+    Result of the median of several timings of fn, each relative to a
+    calibration timed right before it to follow the machine's speed
+    """
+    samples = []
+    for _ in range(runs):
+        unit = calibrate()
+        us = measure(fn)
+        samples.append((us / unit, us))
+    relative, us = sorted(samples)[len(samples) // 2]
+    return {'us_per_frame': round(us, 3), 'fps': round(1e6 / us, 1), 'relative': round(relative, 4)}
+
+
+def bench_animations(screen):
+    cases = {}
+    packages = sorted(p.name for p in r.files('animations').iterdir()
+                      if p.is_dir() and any(f.name.endswith('.txt') for f in p.iterdir()))
+    for package in packages:
+        win = screen.newwin(20, 80, 3, 0)
+        anim = Animation(package, win, {'default': 1 << 8, '#': 2 << 8, '(': 3 << 8, ')': 4 << 8})
+        cases[f'animation.{package}'] = anim._play_animation
+    return cases
+
+
+def bench_snake(screen):
+    cases = {}
+    for length in SNAKE_LENGTHS:
+        game = SnakeGame(screen.newwin(20, 80, 3, 0))
+        snake = game.game
+        snake.snake.clear()
+        # Lay the snake out row by row inside the board
+        cells = [(y, x) for y in range(1, snake.height - 1) for x in range(1, snake.width - 1)]
+        snake.snake.extend(cells[:length])
+        cases[f'snake.draw.len{length}'] = game.draw
+    return cases
+
+
+def bench_space(screen):
+    full = MiniSpaceInvadersGame(screen.newwin(20, 80, 3, 0))
+    depleted = MiniSpaceInvadersGame(screen.newwin(20, 80, 3, 0))
+    for enemy in range(2, len(depleted.game.formation)):
+        depleted.game.formation.kill(enemy)
+    return {'space.draw.full': full.draw, 'space.draw.depleted': depleted.draw}
+
+
+def bench_panels(screen):
+    pet = Pet.__new__(Pet)
+    pet.name, pet.health, pet.fatigue, pet.sleepy, pet.experience = 'Bench', 10, 2.5, 3.25, 120
+    status = screen.newwin(15, 0, 0, 90)
+    legend = screen.newwin(10, 0, 15, 90)
+    return {
+        'display_pet': lambda: display_pet(status, pet),
+        'draw_legend': lambda: draw_legend(legend),
+    }
+
+
+def collect():
+    """Every benchmark, as a function drawing one frame, by name"""
+    install_acs()
+    screen = HeadlessScreen(40, 140)
+    cases = {}
+    for bench in (bench_animations, bench_snake, bench_space, bench_panels):
+        cases.update(bench(screen))
+    return cases
+
+
+def run(cases):
+    return {name: time_case(fn) for name, fn in cases.items()}
+
+
+def slowdown(result, base):
+    """How many times slower result is than base, relative to the calibration when both have it"""
+    key = 'relative' if 'relative' in result and 'relative' in base else 'us_per_frame'
+    return result[key] / base[key]
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Returns the names of benchmarks slower than baseline * (1 + tolerance)"""
+    return [name for name, result in results.items()
+            if name in baseline and slowdown(result, baseline[name]) > 1 + tolerance]
+
+
+def confirm(cases, names, baseline, tolerance=TOLERANCE, retries=RETRIES):
+    """Times the given benchmarks again, returning those still over tolerance every time"""
+    confirmed = []
+    for name in names:
+        for _ in range(retries):
+            change = slowdown(time_case(cases[name]), baseline[name]) - 1
+            print(f"{name:<28} timed again {change * 100:+6.1f}%")
+            if change <= tolerance:
+                break
+        else:
+            confirmed.append(name)
+    return confirmed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', type=Path, default=RESULTS_PATH, help="where to write the results JSON")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help="allowed slowdown, 0.5 = 50%%")
+    parser.add_argument('--update-baseline', action='store_true', help="store the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    cases = collect()
+    results = run(cases)
+    args.out.write_text(json.dumps(results, indent=4))
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        delta = f"{(slowdown(result, base) - 1) * 100:+6.1f}%" if base else "    new"
+        print(f"{name:<28} {result['us_per_frame']:10.1f} us/frame {result['fps']:12.1f} fps  {delta}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=4))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = confirm(cases, compare(results, baseline, args.tolerance), baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSION: {', '.join(regressions)} slower than baseline by more than {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,8 @@ from .idleCommand import IdleCommand
 from .spaceCommand import SpaceCommand
 from .quitCommand import QuitCommand
 from .deadCommand import DeadCommand
+from .perfCommand import PerfCommand
+from render import compositor
 
 COMMANDS = {
     "kill": DeadCommand(),
@@ -14,11 +16,18 @@ COMMANDS = {
     "snake": SnakeCommand(),
     "space": SpaceCommand(),
     "fire": FireCommand(),
+    "perf": PerfCommand(),
     "quit": QuitCommand()
 }
 
-def execute_command(name, state, window = 'pet'):
-    if state.anim:
-        state.anim.stop()
-    state.pet.awake()
-    return COMMANDS[name].execute(state.windows[window], state.pet)
+def execute_command(name, state, window = None):
+    command = COMMANDS[name]
+    window = window or command.window
+    # Commands init colours and hand animations over, so they hold the render lock
+    with compositor.lock:
+        if command.keeps_animation:
+            return command.execute(state.windows[window], state.pet) or state.anim
+        if state.anim:
+            state.anim.stop()
+        state.pet.awake()
+        return command.execute(state.windows[window], state.pet)
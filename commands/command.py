@@ -1,6 +1,5 @@
 from animations import Animation
 from configs.config_loader import config
-import curses
 
 
 class Command():
@@ -8,19 +7,21 @@ class Command():
         self.name = name
         self.description = "" 
         self.animation = None
+        self.fps = None  # Overrides the animation fps from layout.json
+        self.window = "pet"  # Window the command draws into
+        self.keeps_animation = False  # Leaves the running animation playing
 
 
     def _animate(self, window, color_pairs=None):
         """Starts the animation based on the command name and colors it"""
         if not color_pairs:
-            curses.init_pair(11, curses.COLOR_GREEN, -1)
-            color_pairs = {'default': curses.color_pair(11)}
+            color_pairs = config.get_command_colors(self.name)
         
-        self.animation = Animation(self.name, window, color_pairs)
+        fps = self.fps or config.get_animation_fps(self.name)
+        self.animation = Animation(self.name, window, color_pairs, fps)
         self.animation.start()
         return self.animation
 
     def execute(self, window, pet):
         """Execute the command and colors the relative animation"""
-        config.init_colors()
         return self._animate(window, config.get_command_colors(self.name))
\ No newline at end of file
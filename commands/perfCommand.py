@@ -0,0 +1,19 @@
+# commands/perfCommand.py
+from .command import Command
+from render import profiler
+
+
+class PerfCommand(Command):
+    def __init__(self):
+        super().__init__("perf")
+        self.description = "Toggles frame timings overlay"
+        self.window = "status"
+        self.keeps_animation = True
+
+    def execute(self, window, pet):
+        profiler.overlay = not profiler.overlay
+        # Clear what the other view left in the status window
+        window.erase()
+        window.border('|', '|', '=', '=', '+', '+', '+', '+')
+        window.noutrefresh()
+        return None
@@ -1,6 +1,6 @@
 import json
-import curses
 from pathlib import Path
+from .palette import Palette
 
 class ConfigLoader:
     """Loads and manages configuration from JSON files."""
@@ -9,7 +9,8 @@ class ConfigLoader:
         self.config_dir = Path(__file__).parent
         self._layout = None
         self._colors = None
-        self._colors_initialized = False
+        self._storage = None
+        self._palette = None
     
     @property
     def layout(self):
@@ -27,27 +28,42 @@ class ConfigLoader:
                 self._colors = json.load(f)
         return self._colors
     
+    @property
+    def storage(self):
+        """Load storage configuration."""
+        if self._storage is None:
+            with open(self.config_dir / 'storage.json', 'r') as f:
+                self._storage = json.load(f)
+        return self._storage
+    
+    @property
+    def palette(self):
+        """Colour pairs and attributes built from colors.json."""
+        if self._palette is None:
+            self._palette = Palette(self.colors)
+        return self._palette
+    
     def init_colors(self):
-        """Initialize all curses color pairs."""
-        if self._colors_initialized:
-            return
-        
-        curses.start_color()
-        curses.use_default_colors()
-        
-        # Initialize each color pair from config
-        for pair_id, (fg, bg) in self.colors['color_pairs'].items():
-            # Handle special color names
-            if fg == "COLORS_MINUS_10":
-                fg_color = curses.COLORS - 10
-            elif isinstance(fg, str):
-                fg_color = getattr(curses, f'COLOR_{fg}')
-            else:
-                fg_color = fg
-            
-            curses.init_pair(int(pair_id), fg_color, bg)
-        
-        self._colors_initialized = True
+        """Initialize all curses color pairs, once."""
+        self.palette.init()
+    
+    def get_animation_fps(self, command_name):
+        """Get frames per second of a command's animation from layout.json."""
+        animation = self.layout.get('animation', {})
+        return animation.get('fps', {}).get(command_name, animation.get('default_fps', 5))
+    
+    def get_game_tick_rate(self, game_name):
+        """Get simulation steps per second of a game from layout.json."""
+        games = self.layout.get('games', {})
+        return games.get('tick_rate', {}).get(game_name, games.get('default_tick_rate', 20))
+    
+    def get_game_render_fps(self):
+        """Get the most frames per second games are redrawn at from layout.json."""
+        return self.layout.get('games', {}).get('render_fps', 30)
+    
+    def get_save_interval(self):
+        """Get seconds between background writes of the save files from storage.json."""
+        return self.storage.get('save', {}).get('flush_interval', 1.0)
     
     def get_command_colors(self, command_name):
         """Get color mapping for a specific command.
@@ -56,18 +72,10 @@ class ConfigLoader:
             command_name: Name of the command (e.g., 'fire', 'idle')
             
         Returns:
-            Dictionary mapping characters to curses color_pair objects
+            Dictionary mapping characters to curses color_pair objects,
+            shared between calls so it must not be modified
         """
-        if command_name not in self.colors['commands']:
-            # Default color if command not found
-            return {'default': curses.color_pair(11)}
-        
-        # Convert pair IDs to curses color_pair objects
-        color_map = {}
-        for char, pair_id in self.colors['commands'][command_name].items():
-            color_map[char] = curses.color_pair(pair_id)
-        
-        return color_map
+        return self.palette.command_colors(command_name)
 
 # Global instance for configuration
 config = ConfigLoader()
\ No newline at end of file
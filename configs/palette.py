@@ -0,0 +1,112 @@
+import curses
+
+# Pair used by commands without an entry in colors.json
+DEFAULT_PAIR = 11
+
+
+class Palette:
+    """
+    Owns every curses colour pair of the game. Pairs are allocated once,
+    in init(), and every lookup afterwards is a dictionary hit:
+
+        palette.attr(55)                   # attribute of a colors.json pair
+        palette.ui('cursor')               # attribute of a named UI colour
+        palette.command_colors('fire')     # character -> attribute table
+
+    Pairs listed in colors.json keep their ids, named UI colours get the
+    free ids after them, and defining an id twice raises a ValueError.
+    """
+
+    def __init__(self, colors: dict):
+        self._specs = {}  # pair id -> (fg, bg) as written in the config
+        self._names = {}  # UI colour name -> pair id, or list of pair ids
+        self._attrs = {}
+        self._tables = {}
+        self._commands = colors.get('commands', {})
+        self.initialized = False
+
+        for pair_id, spec in colors.get('color_pairs', {}).items():
+            self.define(int(pair_id), *spec)
+        for name, spec in colors.get('ui', {}).items():
+            if spec and isinstance(spec[0], list):
+                self._names[name] = [self.define(None, *shade) for shade in spec]
+            else:
+                self._names[name] = self.define(None, *spec)
+
+        for command, mapping in self._commands.items():
+            for char, pair_id in mapping.items():
+                if pair_id not in self._specs:
+                    raise ValueError(f"Colour of '{char}' in command '{command}' uses undefined pair {pair_id}")
+
+    def define(self, pair_id, fg, bg):
+        """
+        Registers a colour pair, allocating the first free id when pair_id is None
+
+        :return: the pair id
+        :raises ValueError: if pair_id is already defined
+        """
+        if pair_id is None:
+            pair_id = 1
+            while pair_id in self._specs:
+                pair_id += 1
+        elif pair_id in self._specs:
+            raise ValueError(f"Colour pair {pair_id} is defined twice: {self._specs[pair_id]} and {(fg, bg)}")
+        self._specs[pair_id] = (fg, bg)
+        if self.initialized:
+            curses.init_pair(pair_id, _resolve(fg), _resolve(bg))
+        return pair_id
+
+    def init(self):
+        """Starts curses colours and initializes every pair, once"""
+        if self.initialized:
+            return
+        curses.start_color()
+        curses.use_default_colors()
+        for pair_id, (fg, bg) in self._specs.items():
+            if pair_id >= curses.COLOR_PAIRS:
+                raise ValueError(f"Colour pair {pair_id} is beyond the {curses.COLOR_PAIRS} pairs of this terminal")
+            curses.init_pair(pair_id, _resolve(fg), _resolve(bg))
+        self.initialized = True
+
+    def attr(self, pair_id):
+        """Curses attribute of a colour pair"""
+        attr = self._attrs.get(pair_id)
+        if attr is None:
+            attr = self._attrs[pair_id] = _color_pair(pair_id)
+        return attr
+
+    def ui(self, name):
+        """Attribute of a named UI colour, or a list of them for a list of shades"""
+        pair_id = self._names[name]
+        if isinstance(pair_id, list):
+            return [self.attr(i) for i in pair_id]
+        return self.attr(pair_id)
+
+    def command_colors(self, command_name):
+        """
+        Mapping of characters to curses attributes for a command's animation,
+        built once per command. The same dict is returned on every call, so
+        callers must not modify it.
+        """
+        table = self._tables.get(command_name)
+        if table is None:
+            mapping = self._commands.get(command_name, {'default': DEFAULT_PAIR})
+            table = self._tables[command_name] = {char: self.attr(pair_id) for char, pair_id in mapping.items()}
+        return table
+
+
+def _resolve(color):
+    """Converts a colour from the config (name, number or COLORS_MINUS_n) to a curses colour number"""
+    if not isinstance(color, str):
+        return color
+    if color.startswith('COLORS_MINUS_'):
+        return curses.COLORS - int(color[len('COLORS_MINUS_'):])
+    return getattr(curses, f'COLOR_{color}')
+
+
+def _color_pair(pair_id):
+    """curses.color_pair, which needs initscr, computed directly on headless screens"""
+    try:
+        return curses.color_pair(pair_id)
+    except curses.error:
+        return pair_id << 8
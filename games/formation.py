@@ -0,0 +1,161 @@
+# games/formation.py
+import random
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # formations fall back to plain lists without numpy
+    np = None
+
+
+class Formation:
+    """
+    Invaders stored as parallel sequences indexed by enemy, in formation
+    order: home cell (x, y), alive flag, type and points. The formation
+    moves as a whole by its offset, so a step never touches the enemies.
+    Collisions look up the cells around a bullet in a grid of live
+    enemies, and removed enemies are swapped out of a packed list of live
+    ones, which shooters are picked from.
+
+    This is the plain Python version, ArrayFormation keeps the sequences
+    in numpy arrays.
+    """
+
+    def __init__(self, rows, cols, left, spacing, level):
+        self.offset_y = self.offset_x = 0
+        self.size = rows * cols
+        self.y = [2 + (i // cols) * 2 for i in range(self.size)]
+        self.x = [left + (i % cols) * spacing for i in range(self.size)]
+        self.type = [min(i // cols, 2) for i in range(self.size)]  # Different types based on row
+        self.points = [(3 - t) * level for t in self.type]  # More points for harder enemies
+        self.alive = [True] * self.size
+        self.count = self.size  # live enemies
+        self.live = list(range(self.size))  # live enemies packed at the front
+        self.slot = list(range(self.size))  # position of each live enemy in live
+        self.grid = {(y, x): i for i, (y, x) in enumerate(zip(self.y, self.x))}
+        # Live enemies per column and row, to find the edges of the formation
+        self.columns = Counter(self.x)
+        self.rows = Counter(self.y)
+
+    def __len__(self):
+        return self.size
+
+    def move(self, dy, dx):
+        self.offset_y += dy
+        self.offset_x += dx
+
+    def edges(self):
+        """Leftmost and rightmost x of the live enemies on screen"""
+        return min(self.columns) + self.offset_x, max(self.columns) + self.offset_x
+
+    def bottom(self):
+        """Lowest y of the live enemies on screen"""
+        return max(self.rows) + self.offset_y
+
+    def hit(self, y, x):
+        """First live enemy, in formation order, within one cell of (y, x), or None"""
+        y, x = y - self.offset_y, x - self.offset_x
+        near = None
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                i = self.grid.get((y + dy, x + dx))
+                if i is not None and (near is None or i < near):
+                    near = i
+        return near
+
+    def kill(self, i):
+        """Removes a live enemy, returns its points"""
+        self.alive[i] = False
+        del self.grid[(self.y[i], self.x[i])]
+        self._unpack(i)
+        for counter, key in ((self.columns, self.x[i]), (self.rows, self.y[i])):
+            counter[key] -= 1
+            if not counter[key]:
+                del counter[key]
+        return self.points[i]
+
+    def shooter(self):
+        """(y, x) on screen of a random live enemy"""
+        i = self.live[random.randrange(self.count)]
+        return self.y[i] + self.offset_y, self.x[i] + self.offset_x
+
+    def positions(self):
+        """(y, x, type) on screen of every live enemy"""
+        for i in self.live[:self.count]:
+            yield self.y[i] + self.offset_y, self.x[i] + self.offset_x, self.type[i]
+
+    def _unpack(self, i):
+        """Swaps the last live enemy into the slot of i"""
+        self.count -= 1
+        last = self.live[self.count]
+        slot = self.slot[i]
+        self.live[slot], self.live[self.count] = last, i
+        self.slot[last], self.slot[i] = slot, self.count
+
+
+class ArrayFormation(Formation):
+    """
+    Formation in numpy arrays: it is laid out, measured and drawn with
+    vector operations, and the grid of live enemies is a 2D array of
+    enemy indices (-1 for none) so a level of thousands of invaders is
+    built without a Python loop.
+    """
+
+    def __init__(self, rows, cols, left, spacing, level):
+        if np is None:
+            raise ImportError("ArrayFormation requires numpy, install it with 'pip install numpy'")
+        self.offset_y = self.offset_x = 0
+        self.size = rows * cols
+        row, col = np.divmod(np.arange(self.size), cols)
+        self.y = 2 + row * 2
+        self.x = left + col * spacing
+        self.type = np.minimum(row, 2)
+        self.points = (3 - self.type) * level
+        self.alive = np.ones(self.size, dtype=bool)
+        self.count = self.size
+        self.live = np.arange(self.size)
+        self.slot = np.arange(self.size)
+        self.grid = np.full((2 * rows + 2, left + cols * spacing + 1), -1)
+        self.grid[self.y, self.x] = np.arange(self.size)
+        # Live enemies per column and row, indexed by the home x and y
+        self.columns = np.bincount(self.x)
+        self.rows = np.bincount(self.y)
+
+    def edges(self):
+        columns = np.flatnonzero(self.columns)
+        return int(columns[0]) + self.offset_x, int(columns[-1]) + self.offset_x
+
+    def bottom(self):
+        return int(np.flatnonzero(self.rows)[-1]) + self.offset_y
+
+    def hit(self, y, x):
+        y, x = y - self.offset_y, x - self.offset_x
+        if y + 1 < 0 or x + 1 < 0:
+            return None
+        # A window of at most 3x3 cells is quicker to scan as lists than with numpy
+        near = [i for row in self.grid[max(y - 1, 0):y + 2, max(x - 1, 0):x + 2].tolist() for i in row if i >= 0]
+        return min(near) if near else None
+
+    def kill(self, i):
+        y, x = self.y[i], self.x[i]
+        self.alive[i] = False
+        self.grid[y, x] = -1
+        self.columns[x] -= 1
+        self.rows[y] -= 1
+        self._unpack(i)
+        return int(self.points[i])
+
+    def shooter(self):
+        i = self.live[random.randrange(self.count)]
+        return int(self.y[i]) + self.offset_y, int(self.x[i]) + self.offset_x
+
+    def positions(self):
+        live = self.live[:self.count]
+        return zip((self.y[live] + self.offset_y).tolist(), (self.x[live] + self.offset_x).tolist(),
+                   self.type[live].tolist())
+
+
+def make_formation(rows, cols, left, spacing, level):
+    """ArrayFormation when numpy is installed, Formation otherwise"""
+    cls = Formation if np is None else ArrayFormation
+    return cls(rows, cols, left, spacing, level)
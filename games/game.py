@@ -1,9 +1,15 @@
 # games/game.py
 import threading
-import time
 from abc import abstractmethod
 import curses
 from enum import Enum
+from configs.config_loader import config
+from render import compositor, profiler
+
+# Most simulation steps run in one frame to catch up, the rest of the backlog is dropped
+MAX_STEPS_PER_FRAME = 5
+# Longest the compositor waits before checking on a game that is not playing
+IDLE_RECHECK = 0.5
 
 class GameState(Enum):
     PLAYING = 1
@@ -15,61 +21,114 @@ class GameLogic:
     def __init__(self, height, width):
         self.height = height
         self.width = width
+        self.time = 0.0  # simulated seconds, only advances while playing
         self.reset()
     
     def reset(self):
         self.score = 0
         self.state = GameState.PLAYING
     
+    def step(self, dt):
+        """Advances the simulated clock by dt seconds and updates the game once"""
+        self.time += dt
+        self.update()
+    
     def update(self):
         if self.state != GameState.PLAYING: 
             return
 
 
 class Game: 
+    """
+    Runs a GameLogic on a fixed timestep: the compositor ticks the game
+    every frame, and it steps the simulation tick_rate times per simulated
+    second whatever the frame rate, catching up on at most
+    MAX_STEPS_PER_FRAME steps when it falls behind. The game is redrawn
+    after a step or an input, at most render_fps times per second.
+    """
+    name = None  # key of the game's tick rate in layout.json
+
     def __init__(self, window):
         self.window = window
         self.stop_event = threading.Event()
-        self.thread = None
         self.game = None
-        self.last_update = time.time()
-        self.update_interval = 0.05
+        self.tick_rate = config.get_game_tick_rate(self.name)
+        self.render_fps = config.get_game_render_fps()
+        self.timestep = 1.0 / self.tick_rate
+        self.accumulator = 0.0  # real seconds not simulated yet
+        self.last_tick = None
+        self.dirty = True  # something changed since the last draw
+        self.next_draw = 0
+        self.next_frame = 0
         self.win_height, self.win_width = self.window.getmaxyx()
 
     def start(self):  
         """
-        Start game thread
+        Hand the game over to the compositor, which runs it
         """
         self.stop_event.clear()
-        self.thread = threading.Thread(target=self._run)
-        self.thread.daemon = True
-        self.thread.start()
+        compositor.add(self)
         return self
     
     def stop(self):
-        """Kill game thread and return final score"""
+        """Remove game from the compositor and return final score"""
         if hasattr(self, 'game') and self.game:
             self.final_score = self.game.score  # Store it here
         
-        if self.thread:
-            self.stop_event.set()
-            self.thread.join(timeout=0.5)
+        self.stop_event.set()
+        compositor.remove(self)
         
         return self.final_score
     
-    def _run(self):
+    def invalidate(self):
+        """Picks up the window size again and redraws on the next frame, after a resize"""
+        self.win_height, self.win_width = self.window.getmaxyx()
+        self.redraw()
+
+    def redraw(self):
+        """Redraws on the next frame, after the game changed outside of a step"""
+        self.dirty = True
+        self.next_draw = self.next_frame = 0
+        compositor.wake()
+
+    def tick(self, now):
         """
-        Update game until thread is killed
+        Called by the compositor every frame, runs the simulation steps due
+        since the last tick and redraws the game if it changed
         """
-        while not self.stop_event.is_set():
-            current_time = time.time()
-            
-            if current_time - self.last_update >= self.update_interval:
-                self.game.update()
-                self.last_update = current_time
-            
-            self.draw()
-            time.sleep(0.05)
+        if self.stop_event.is_set():
+            return False
+        
+        if self.last_tick is not None and self.game.state == GameState.PLAYING:
+            self.accumulator += now - self.last_tick
+        self.last_tick = now
+        steps = 0
+        while self.accumulator >= self.timestep:
+            if steps == MAX_STEPS_PER_FRAME or self.game.state != GameState.PLAYING:
+                self.accumulator = 0.0
+                break
+            with profiler.phase('game.update'):
+                self.game.step(self.timestep)
+            self.accumulator -= self.timestep
+            steps += 1
+        self.dirty = self.dirty or steps > 0
+        
+        drawn = False
+        if self.dirty and now >= self.next_draw:
+            with profiler.phase('game.draw'):
+                self.draw()
+            self.dirty = False
+            self.next_draw = now + 1.0 / self.render_fps
+            drawn = True
+        
+        # Wake up for the next step, or a redraw still held back by the render cap
+        if self.game.state == GameState.PLAYING:
+            self.next_frame = now + self.timestep - self.accumulator
+        else:
+            self.next_frame = now + IDLE_RECHECK
+        if self.dirty:
+            self.next_frame = min(self.next_frame, self.next_draw)
+        return drawn
 
     def _convert_wasd_to_arrow(self, key):
         """
@@ -93,6 +152,7 @@ class Game:
         """
         if not isinstance(key, int):
             return None
+        self.redraw()
         
         # Convert WASD if needed 
         key = self._convert_wasd_to_arrow(key)
@@ -135,11 +195,11 @@ class Game:
         
         self.window.noutrefresh()
     
-    def draw_game_over(self, height, width):
+    def draw_game_over(self, height, width, title="GAME  OVER"):
         """Draw game over screen"""
         game_over = [
             "+------------------+",
-            "|   GAME  OVER     |",
+            f"|   {title:<15}|",
             "+------------------+",
             f"|  Score: {self.game.score:6d}   |",
             "+------------------+",
@@ -3,6 +3,39 @@ import random
 from collections import deque
 from .game import Game, GameState, GameLogic
 
+class FreeCells:
+    """
+    Set of board cells that also supports picking one at random in O(1):
+    cells are kept in a list, and a removed cell is replaced by the last one
+    """
+    def __init__(self, cells=()):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+    
+    def __len__(self):
+        return len(self.cells)
+    
+    def __contains__(self, cell):
+        return cell in self.index
+    
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+    
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+    
+    def choice(self):
+        return random.choice(self.cells)
+
+
 class Snake(GameLogic):
     def __init__(self, height=15, width=30):
         super().__init__(height, width)
@@ -10,17 +43,21 @@ class Snake(GameLogic):
     def reset(self):
         super().reset()
         self.snake = deque([(self.height//2, self.width//4)])
+        # Cells of the snake, and cells food can be placed on, kept in sync with it
+        self.occupied = set(self.snake)
+        self.free = FreeCells((y, x) for y in range(1, self.height-3) for x in range(1, self.width-3)
+                              if (y, x) not in self.occupied)
         self.direction = curses.KEY_RIGHT
         self.food = None
         self.place_food()
     
     def place_food(self):
-        while True:
-            y = random.randint(1, self.height-4)
-            x = random.randint(1, self.width-4)
-            if (y, x) not in self.snake:
-                self.food = (y, x)
-                break
+        """Drops food on a random free cell, the game is won when there is none left"""
+        if not self.free:
+            self.food = None
+            self.state = GameState.WIN
+            return
+        self.food = self.free.choice()
     
     def update(self):
         head_y, head_x = self.snake[0]
@@ -50,18 +87,23 @@ class Snake(GameLogic):
         new_head = (y, x)
 
         # Check collision with self ONLY
-        if new_head in self.snake:
+        if new_head in self.occupied:
             self.state = GameState.GAME_OVER
             return
 
         # Move 
         self.snake.appendleft(new_head)
+        self.occupied.add(new_head)
+        self.free.discard(new_head)
 
         if new_head == self.food:
             self.score += 10
             self.place_food()
         else:
-            self.snake.pop()
+            tail = self.snake.pop()
+            self.occupied.discard(tail)
+            if 1 <= tail[0] <= self.height-4 and 1 <= tail[1] <= self.width-4:
+                self.free.add(tail)
 
     
     def toggle_pause(self):
@@ -73,6 +115,8 @@ class Snake(GameLogic):
 
     
 class SnakeGame(Game):
+    name = "snake"
+
     def __init__(self, window):
         super().__init__(window)        
         win_height, win_width = self.window.getmaxyx()
@@ -87,6 +131,8 @@ class SnakeGame(Game):
         
         if self.game.state == GameState.GAME_OVER:
             self.draw_game_over(win_height, win_width)
+        elif self.game.state == GameState.WIN:
+            self.draw_game_over(win_height, win_width, "BOARD FULL!")
         elif self.game.state == GameState.PAUSED:
             self.draw_paused(win_height, win_width)
         else:  # PLAYING
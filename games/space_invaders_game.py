@@ -1,9 +1,25 @@
 import curses
-import time
 import random
+from collections import Counter
+from .formation import make_formation
 from .game import Game, GameState, GameLogic
     
 class MiniSpaceInvaders(GameLogic):
+    """
+    Collisions go through grids keyed by cell instead of scanning every
+    object: bunkers by position, live enemies by their cell relative to
+    the formation, which moves as a whole by changing its offset, and
+    enemy bullets by position around the player. A tick then costs in
+    proportion to the bullets in flight, not to the enemies and bunkers.
+    The enemies are a Formation of parallel arrays, numpy ones when it is
+    installed, so levels of thousands of invaders stay playable.
+
+    A tick rebuilds the bullet lists and a reset the bunkers, so every
+    change from outside a tick, like the player's keys, must hold
+    compositor.lock as handle_game_input does.
+    """
+    ENEMY_SYMBOLS = ['◉', '◈', '◆']  # Different enemy symbols
+
     def __init__(self, height=20, width=40):
         super().__init__(height, width)
     
@@ -18,30 +34,16 @@ class MiniSpaceInvaders(GameLogic):
         # Bullets
         self.bullets = []
         self.bullet_speed = 2
-        self.last_shot_time = 0
+        self.last_shot_time = float("-inf")  # the first shot is never held back
         self.shot_cooldown = 0.3
         
         # Enemies
-        self.enemies = []
         self.enemy_direction = 1
         self.enemy_speed = 0.8
-        self.last_enemy_move = time.time()
+        self.last_enemy_move = self.time
         self.enemy_bullets = []
         self.enemy_shoot_chance = 0.02
-        
-        # Create enemy grid with different types
-        enemy_types = ['◉', '◈', '◆']  # Different enemy symbols
-        for row in range(4):
-            for col in range(8):
-                enemy_type = min(row, 2)  # Different types based on row
-                self.enemies.append({
-                    'x': 3 + col * 4,
-                    'y': 2 + row * 2,
-                    'alive': True,
-                    'type': enemy_type,
-                    'symbol': enemy_types[enemy_type],
-                    'points': (3 - enemy_type) # More points for harder enemies
-                })
+        self.create_formation(rows=4, cols=8, left=3, spacing=4, level=1)
         
         # Game state
         #self.score = 0
@@ -50,10 +52,14 @@ class MiniSpaceInvaders(GameLogic):
         self.message = ""
         self.message_time = 0
         
-        # Bunkers (defense)
-        self.bunkers = []
+        # Bunkers (defense), by cell
+        self.bunkers = {}
         self.create_bunkers()
     
+    def create_formation(self, rows, cols, left, spacing, level):
+        """Create the enemy grid with different types"""
+        self.formation = make_formation(rows, cols, left, spacing, level)
+    
     def create_bunkers(self):
         """Create protective bunkers for player"""
         for i in range(3):
@@ -63,101 +69,66 @@ class MiniSpaceInvaders(GameLogic):
                     if (y_offset == 2 or 
                         (y_offset == 1 and x_offset in [1, 2, 3]) or
                         (y_offset == 0 and x_offset == 2)):
-                        self.bunkers.append({
-                            'x': center_x - 2 + x_offset,
-                            'y': self.height - 8 + y_offset,
-                            'health': 3
-                        })
+                        x, y = center_x - 2 + x_offset, self.height - 8 + y_offset
+                        self.bunkers[(y, x)] = {'x': x, 'y': y, 'health': 3}
+    
+    def hit_bunker(self, y, x):
+        """Damages the bunker at (y, x), False if there is none"""
+        bunker = self.bunkers.get((y, x))
+        if bunker is None:
+            return False
+        bunker['health'] -= 1
+        if bunker['health'] <= 0:
+            del self.bunkers[(y, x)]
+        return True
     
     def update(self):
         super().update()
-        current_time = time.time()
-        
-        # Move player bullets
-        bullets_to_remove = []
-        for i, (y, x) in enumerate(self.bullets):
-            # Check if bullet hit bunker
-            for bunker in self.bunkers[:]:
-                if bunker['x'] == x and bunker['y'] == y:
-                    bunker['health'] -= 1
-                    if bunker['health'] <= 0:
-                        self.bunkers.remove(bunker)
-                    bullets_to_remove.append(i)
-                    break
-            else:  # No bunker hit
-                new_y = y - self.bullet_speed
-                if new_y > 0:
-                    self.bullets[i] = (new_y, x)
-                else:
-                    bullets_to_remove.append(i)
+        current_time = self.time
         
-        # Remove bullets that hit or left screen
-        for idx in sorted(bullets_to_remove, reverse=True):
-            if idx < len(self.bullets):
-                self.bullets.pop(idx)
+        # Move player bullets, dropping those that hit a bunker or left the screen
+        bullets = []
+        for y, x in self.bullets:
+            if not self.hit_bunker(y, x) and y - self.bullet_speed > 0:
+                bullets.append((y - self.bullet_speed, x))
+        self.bullets = bullets
         
         # Move enemies periodically
-        if current_time - self.last_enemy_move >= self.enemy_speed:
+        formation = self.formation
+        if current_time - self.last_enemy_move >= self.enemy_speed and formation.count:
             self.last_enemy_move = current_time
             
             # Check if enemies hit side
-            change_direction = False
-            for enemy in self.enemies:
-                if enemy['alive']:
-                    if (enemy['x'] <= 1 and self.enemy_direction == -1) or \
-                       (enemy['x'] >= self.width - 2 and self.enemy_direction == 1):
-                        change_direction = True
-                        break
-            
-            if change_direction:
+            left, right = formation.edges()
+            if (left <= 1 and self.enemy_direction == -1) or \
+               (right >= self.width - 2 and self.enemy_direction == 1):
                 self.enemy_direction *= -1
-                for enemy in self.enemies:
-                    if enemy['alive']:
-                        enemy['y'] += 1
-                        # Check if enemies reached bottom
-                        if enemy['y'] >= self.player_y - 2:
-                            self.state = GameState.GAME_OVER
-                            self.message = "Invaders reached Earth!"
-                            return
+                formation.move(1, 0)
+                # Check if enemies reached bottom
+                if formation.bottom() >= self.player_y - 2:
+                    self.state = GameState.GAME_OVER
+                    self.message = "Invaders reached Earth!"
+                    return
             else:
-                for enemy in self.enemies:
-                    if enemy['alive']:
-                        enemy['x'] += self.enemy_direction
+                formation.move(0, self.enemy_direction)
         
         # Enemy shooting
-        alive_enemies = [e for e in self.enemies if e['alive']]
-        if alive_enemies and random.random() < self.enemy_shoot_chance:
-            shooter = random.choice(alive_enemies)
-            self.enemy_bullets.append((shooter['y'] + 1, shooter['x']))
+        if formation.count and random.random() < self.enemy_shoot_chance:
+            y, x = formation.shooter()
+            self.enemy_bullets.append((y + 1, x))
         
         # Move enemy bullets
-        enemy_bullets_to_remove = []
-        for i, (y, x) in enumerate(self.enemy_bullets):
-            # Check if hit bunker
-            for bunker in self.bunkers[:]:
-                if bunker['x'] == x and bunker['y'] == y:
-                    bunker['health'] -= 1
-                    if bunker['health'] <= 0:
-                        self.bunkers.remove(bunker)
-                    enemy_bullets_to_remove.append(i)
-                    break
-            else:
-                new_y = y + 1
-                if new_y < self.height:
-                    self.enemy_bullets[i] = (new_y, x)
-                else:
-                    enemy_bullets_to_remove.append(i)
-        
-        # Remove enemy bullets
-        for idx in sorted(enemy_bullets_to_remove, reverse=True):
-            if idx < len(self.enemy_bullets):
-                self.enemy_bullets.pop(idx)
+        enemy_bullets = []
+        for y, x in self.enemy_bullets:
+            if not self.hit_bunker(y, x) and y + 1 < self.height:
+                enemy_bullets.append((y + 1, x))
+        self.enemy_bullets = enemy_bullets
         
         # Check bullet collisions
         self.check_collisions()
         
         # Check win condition
-        if not any(e['alive'] for e in self.enemies):
+        if not formation.count:
             self.state = GameState.WIN
             self.message = f"Level {self.level} Complete!"
             self.score += 100 * self.level
@@ -166,43 +137,43 @@ class MiniSpaceInvaders(GameLogic):
     def check_collisions(self):
         """Check all collisions between objects"""
         # Player bullets hitting enemies
-        bullets_to_remove = []
-        for bullet_idx, (by, bx) in enumerate(self.bullets):
-            for enemy in self.enemies:
-                if (enemy['alive'] and 
-                    abs(enemy['x'] - bx) <= 1 and 
-                    abs(enemy['y'] - by) <= 1):
-                    
-                    enemy['alive'] = False
-                    bullets_to_remove.append(bullet_idx)
-                    self.score += enemy['points']
-                    self.show_message(f"+{enemy['points']} pts!")
-                    break
-        
-        # Remove bullets that hit enemies
-        for idx in sorted(bullets_to_remove, reverse=True):
-            if idx < len(self.bullets):
-                self.bullets.pop(idx)
+        bullets = []
+        for by, bx in self.bullets:
+            enemy = self.formation.hit(by, bx)
+            if enemy is None:
+                bullets.append((by, bx))
+                continue
+            points = self.formation.kill(enemy)
+            self.score += points
+            self.show_message(f"+{points} pts!")
+        self.bullets = bullets
         
-        # Enemy bullets hitting player
-        for bullet in self.enemy_bullets[:]:
-            if (abs(bullet[1] - self.player_x) <= 2 and 
-                abs(bullet[0] - self.player_y) <= 1):
-                
-                self.enemy_bullets.remove(bullet)
-                self.shield -= 25
-                if self.shield <= 0:
-                    self.lives -= 1
-                    self.shield = 100
-                    self.show_message("SHIP HIT!")
-                
-                if self.lives <= 0:
-                    self.state = GameState.GAME_OVER
-                    self.message = "Game Over!"
+        # Enemy bullets hitting player, looked up in the cells around it
+        if not self.enemy_bullets:
+            return
+        bullet_cells = Counter(self.enemy_bullets)
+        hits = 0
+        for y in range(self.player_y - 1, self.player_y + 2):
+            for x in range(self.player_x - 2, self.player_x + 3):
+                hits += bullet_cells.get((y, x), 0)
+        if not hits:
+            return
+        self.enemy_bullets = [(y, x) for y, x in self.enemy_bullets
+                              if abs(x - self.player_x) > 2 or abs(y - self.player_y) > 1]
+        for _ in range(hits):
+            self.shield -= 25
+            if self.shield <= 0:
+                self.lives -= 1
+                self.shield = 100
+                self.show_message("SHIP HIT!")
+            
+            if self.lives <= 0:
+                self.state = GameState.GAME_OVER
+                self.message = "Game Over!"
     
     def shoot(self):
         """Player shoots a bullet"""
-        current_time = time.time()
+        current_time = self.time
         if (current_time - self.last_shot_time >= self.shot_cooldown and
             len([b for b in self.bullets if b[0] > 0]) < 3):
             
@@ -220,7 +191,7 @@ class MiniSpaceInvaders(GameLogic):
     def show_message(self, msg):
         """Display temporary message"""
         self.message = msg
-        self.message_time = time.time()
+        self.message_time = self.time
     
     def next_level(self):
         """Advance to next level"""
@@ -232,19 +203,9 @@ class MiniSpaceInvaders(GameLogic):
     
     def reset_gameplay(self):
         """Reset gameplay elements for new level"""
-        self.enemies = []
-        enemy_types = ['◉', '◈', '◆']
-        for row in range(4 + min(self.level - 1, 2)):  # More rows each level
-            for col in range(8 + min(self.level - 1, 2)):  # More columns
-                enemy_type = min(row, 2)
-                self.enemies.append({
-                    'x': 2 + col * 3,
-                    'y': 2 + row * 2,
-                    'alive': True,
-                    'type': enemy_type,
-                    'symbol': enemy_types[enemy_type],
-                    'points': (3 - enemy_type) * self.level
-                })
+        # More rows and columns each level
+        self.create_formation(rows=4 + min(self.level - 1, 2), cols=8 + min(self.level - 1, 2),
+                              left=2, spacing=3, level=self.level)
         
         self.bullets.clear()
         self.enemy_bullets.clear()
@@ -253,32 +214,16 @@ class MiniSpaceInvaders(GameLogic):
         self.state = GameState.PLAYING
 
 class MiniSpaceInvadersGame(Game):
+    name = "space"
+    # Simulated seconds each player sprite frame shows
+    PLAYER_FRAME_TIME = 0.2
+
     def __init__(self, window):
         super().__init__(window)
         self.game = MiniSpaceInvaders(self.win_height-2, self.win_width-2)
         self.player_frames = ['▲', '△']  # Animation frames for player
-        self.player_frame_idx = 0
-        self.last_frame_change = time.time()
         self._can_advance_level = True
     
-    def _run(self):
-        """Main game loop thread"""
-        while not self.stop_event.is_set():
-            current_time = time.time()
-            
-            # Animate player
-            if current_time - self.last_frame_change >= 0.2:
-                self.player_frame_idx = (self.player_frame_idx + 1) % len(self.player_frames)
-                self.last_frame_change = current_time
-            
-            # Update game
-            if current_time - self.last_update >= self.update_interval:
-                self.game.update()
-                self.last_update = current_time
-            
-            self.draw()
-            time.sleep(0.05)
-    
     def draw(self):
         """Draw the game state with Mini graphics"""
         self.window.erase()
@@ -315,14 +260,12 @@ class MiniSpaceInvadersGame(Game):
         self.window.addstr(1, 2, hud[:width-4])
         
         # Draw enemies
-        for enemy in self.game.enemies:
-            if enemy['alive']:
-                y, x = enemy['y'], enemy['x']
-                if 2 <= y < height-1 and 2 <= x < width-1:
-                    self.window.addch(y, x, enemy['symbol'])
+        for y, x, enemy_type in self.game.formation.positions():
+            if 2 <= y < height-1 and 2 <= x < width-1:
+                self.window.addch(y, x, self.game.ENEMY_SYMBOLS[enemy_type])
         
         # Draw player with animation
-        player_char = self.player_frames[self.player_frame_idx]
+        player_char = self.player_frames[int(self.game.time / self.PLAYER_FRAME_TIME) % len(self.player_frames)]
         y, x = self.game.player_y, self.game.player_x
         if 2 <= y < height-1 and 2 <= x < width-1:
             self.window.addch(y, x, player_char)
@@ -343,14 +286,14 @@ class MiniSpaceInvadersGame(Game):
                 self.window.addch(y, x, '•')
         
         # Draw bunkers
-        for bunker in self.game.bunkers:
+        for bunker in self.game.bunkers.values():
             y, x = bunker['y'], bunker['x']
             if 2 <= y < height-1 and 2 <= x < width-1:
                 char = '█' if bunker['health'] == 3 else '▓' if bunker['health'] == 2 else '▒'
                 self.window.addch(y, x, char)
         
         # Draw temporary message
-        if time.time() - self.game.message_time < 1.5:
+        if self.game.time - self.game.message_time < 1.5:
             msg = self.game.message
             if msg:
                 msg_x = max(2, (width - len(msg)) // 2)
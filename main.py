@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
+import argparse
 import curses
-from tamagotchi import Pet
-from configs import *
-from utils import TerminalState, handle_resize, run_game_loop, get_pet_name
+import sys
+from tamagotchi import Pet, saver
+from configs.config_loader import config
+from render import compositor, profiler
+from utils import TerminalState, CommandHistory, handle_resize, run_game_loop, run_async_game_loop, get_pet_name
 
 # ------------------- MAIN GAME LOOP ------------------- #
-def main(stdscr, pet):
+def main(stdscr, pet, runtime="threads"):
     curses.curs_set(0)
     stdscr.nodelay(True)
+    config.init_colors()
     
     state = TerminalState(
         pet=pet,
@@ -15,24 +19,50 @@ def main(stdscr, pet):
         cmd="",
         windows={},
         running=True,
-        history = [''] * 5,
+        history=CommandHistory(pet.history_path),
         too_small=False
     )
 
     handle_resize(stdscr, state)
-    state = run_game_loop(state, stdscr)
+    if runtime == "asyncio":
+        state = run_async_game_loop(state, stdscr)
+    else:
+        compositor.start()
+        state = run_game_loop(state, stdscr)
 
     # ------ CLEANUP ------- #
     if state.anim:
         state.anim.stop()
+    compositor.stop()
     if state.pet.alive:
         state.pet._save_state()
 
 
 # ------------------- RUN ------------------- #
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tamagotcha, a CLI virtual pet")
+    parser.add_argument("--trace", metavar="FILE", help="stream frame timings to a JSONL file")
+    parser.add_argument("--runtime", choices=["threads", "asyncio"], default="threads",
+                        help="run rendering on a thread (default) or everything on one asyncio loop")
+    args = parser.parse_args()
+    if args.trace:
+        profiler.start_trace(args.trace)
+
     pet = Pet(get_pet_name())
+    goodbye = None
     try:
-        curses.wrapper(main, pet)
+        curses.wrapper(main, pet, args.runtime)
     except KeyboardInterrupt:
-        print("\nGoodbye! Your pet has been saved.")
+        if pet.alive:
+            pet._save_state()
+        goodbye = "\nGoodbye! Your pet has been saved."
+    finally:
+        error = saver.flush()
+        profiler.stop_trace()
+        # curses has ended, tracebacks from the render thread can be shown now
+        for trace in compositor.errors:
+            print(trace, file=sys.stderr)
+        if error is not None:
+            print(f"\nYour pet could not be saved: {error}", file=sys.stderr)
+        elif goodbye:
+            print(goodbye)
@@ -0,0 +1,4 @@
+# render/__init__.py
+from .profiler import FrameProfiler, profiler
+from .compositor import Compositor, compositor
+from .headless import HeadlessScreen, HeadlessWindow, install_acs
@@ -0,0 +1,199 @@
+import asyncio
+import curses
+import threading
+import time
+import traceback
+from collections import deque
+from .profiler import profiler
+
+# Max number of screen flushes per second
+RENDER_FPS = 30
+# Longest sleep of the render thread when nothing is scheduled
+IDLE_WAIT = 0.5
+# Number of render errors whose tracebacks are kept
+ERROR_HISTORY = 10
+
+
+class Compositor:
+    """
+    Owns every curses draw call. Animations and games register as actors
+    that are ticked once per frame, UI panels submit draw requests, and
+    the screen is flushed with a single doupdate per frame.
+    """
+
+    def __init__(self, fps: int = RENDER_FPS, screen=curses):
+        self.fps = fps
+        self.screen = screen  # anything with a doupdate(), the curses module by default
+        self.lock = threading.RLock()
+        self.frames = 0
+        self.last_error = None  # latest exception an actor or draw request raised
+        self.errors = deque(maxlen=ERROR_HISTORY)  # their tracebacks, oldest first
+        self._actors = []
+        self._requests = {}
+        self._wake = threading.Event()
+        self._async_wake = None  # set while run_async drives the compositor
+        self._stop_event = threading.Event()
+        self.thread = None
+
+    def add(self, actor):
+        """
+        Registers an actor, an object with a tick(now) method that draws
+        into its window and returns True when it did
+        """
+        with self.lock:
+            if actor not in self._actors:
+                self._actors.append(actor)
+        self._signal()
+        return actor
+
+    def remove(self, actor):
+        """Unregisters an actor, waiting for its current tick to finish"""
+        with self.lock:
+            if actor in self._actors:
+                self._actors.remove(actor)
+
+    def request(self, key: str, draw):
+        """
+        Queues a draw call for the next frame. Requests with the same key
+        are coalesced so only the latest one is drawn.
+
+        :param key: name of the panel being drawn
+        :param draw: callable doing the curses calls
+        """
+        with self.lock:
+            self._requests[key] = draw
+        self._signal()
+
+    def wake(self):
+        """Re-evaluates the actor deadlines now, after one moved its next_frame earlier"""
+        self._signal()
+
+    def invalidate(self):
+        """Asks every actor to fully repaint, after windows were cleared or replaced"""
+        with self.lock:
+            for actor in self._actors:
+                if hasattr(actor, 'invalidate'):
+                    actor.invalidate()
+
+    def render_frame(self, now: float = None):
+        """
+        Ticks every actor, runs pending draw requests and flushes the
+        screen once if anything was drawn. An actor that raises anything
+        but a curses error is removed, and its traceback kept in errors.
+
+        :return: True if the screen was flushed
+        """
+        if now is None:
+            now = time.monotonic()
+        drawn = False
+        with self.lock:
+            requests, self._requests = self._requests, {}
+            for actor in list(self._actors):
+                try:
+                    drawn = actor.tick(now) or drawn
+                except curses.error:
+                    pass
+                except Exception as e:  # a broken actor must not kill the render thread
+                    self._actors.remove(actor)
+                    self._record_error(e)
+            for key, draw in requests.items():
+                try:
+                    with profiler.phase('draw.' + key):
+                        draw()
+                    drawn = True
+                except curses.error:
+                    pass
+                except Exception as e:  # the request is dropped, the panel redraws when it changes
+                    self._record_error(e)
+            if drawn:
+                with profiler.phase('doupdate'):
+                    self.screen.doupdate()
+                self.frames += 1
+        return drawn
+
+    def next_deadline(self, next_frame: float):
+        """
+        Earliest time anything needs drawing: the next frame if requests are
+        pending, otherwise the earliest actor deadline, never before next_frame
+        """
+        with self.lock:
+            if self._requests:
+                return next_frame
+            # Actors without a deadline yet are due right away
+            deadlines = [getattr(actor, 'next_frame', None) or 0 for actor in self._actors]
+        if not deadlines:
+            return next_frame + IDLE_WAIT
+        return max(next_frame, min(deadlines))
+
+    def start(self):
+        """
+        Starts the render thread
+        """
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stops the render thread after its current frame"""
+        self._stop_event.set()
+        self._wake.set()
+        if self.thread:
+            self.thread.join(timeout=0.5)
+            self.thread = None
+
+    async def run_async(self):
+        """
+        Renders frames like the render thread does, as a task of the running
+        asyncio loop. Actors and requests must then be added from that loop.
+        """
+        loop = asyncio.get_running_loop()
+        wake = self._async_wake = asyncio.Event()
+        period = 1.0 / self.fps
+        next_frame = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= next_frame:
+                    self.render_frame(now)
+                    next_frame = max(next_frame + period, now)
+                wake.clear()
+                # A timer rather than wait_for, which creates a task per wait
+                timer = loop.call_later(max(0.0, self.next_deadline(next_frame) - time.monotonic()), wake.set)
+                try:
+                    await wake.wait()
+                finally:
+                    timer.cancel()
+        finally:
+            self._async_wake = None
+
+    def _record_error(self, error):
+        self.last_error = error
+        self.errors.append(''.join(traceback.format_exception(type(error), error, error.__traceback__)))
+
+    def _signal(self):
+        """Wakes the render thread, or the render task"""
+        self._wake.set()
+        if self._async_wake is not None:
+            self._async_wake.set()
+
+    def _run(self):
+        """
+        Renders frames on a fixed grid of monotonic deadlines, at most fps
+        per second, sleeping until an actor is due or a request comes in
+        """
+        period = 1.0 / self.fps
+        next_frame = time.monotonic()
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            if now >= next_frame:
+                self.render_frame(now)
+                # Stay on the grid, but don't try to catch up on missed frames
+                next_frame = max(next_frame + period, now)
+            self._wake.clear()
+            self._wake.wait(max(0.0, self.next_deadline(next_frame) - time.monotonic()))
+
+
+# Global instance driving the terminal
+compositor = Compositor()
@@ -0,0 +1,311 @@
+"""
+In-memory stand-in for a curses screen and its windows, so renderers can
+draw without a terminal (CI, profiling, snapshot tests).
+
+    screen = HeadlessScreen(40, 140)
+    win = screen.newwin(20, 80, 3, 0)
+    SnakeGame(win).draw()
+    screen.doupdate()
+    print('\n'.join(screen.snapshot()))
+"""
+import curses
+from array import array
+
+# Unicode glyphs for the ncurses alternate character set
+ACS_GLYPHS = {
+    'ACS_ULCORNER': 'l', 'ACS_URCORNER': 'k', 'ACS_LLCORNER': 'm', 'ACS_LRCORNER': 'j',
+    'ACS_HLINE': 'q', 'ACS_VLINE': 'x', 'ACS_LTEE': 't', 'ACS_RTEE': 'u',
+    'ACS_TTEE': 'w', 'ACS_BTEE': 'v', 'ACS_PLUS': 'n', 'ACS_BLOCK': '0',
+    'ACS_CKBOARD': 'a', 'ACS_BULLET': '~', 'ACS_DIAMOND': '`', 'ACS_DEGREE': 'f',
+}
+ACS_UNICODE = {
+    'l': '┌', 'k': '┐', 'm': '└', 'j': '┘', 'q': '─', 'x': '│', 't': '├', 'u': '┤',
+    'w': '┬', 'v': '┴', 'n': '┼', '0': '█', 'a': '▒', '~': '·', '`': '◆', 'f': '°',
+}
+CHAR_MASK = 0xff
+BLANK = ord(' ')
+
+
+def install_acs():
+    """
+    Defines the curses.ACS_* constants, which curses only creates in
+    initscr(), using the same values as ncurses
+    """
+    for name, char in ACS_GLYPHS.items():
+        if not hasattr(curses, name):
+            setattr(curses, name, curses.A_ALTCHARSET | ord(char))
+
+
+def _split_ch(ch, attr):
+    """Splits an addch/border character into (codepoint, attr)"""
+    if isinstance(ch, str):
+        return ord(ch), attr
+    if ch & curses.A_ALTCHARSET:
+        glyph = ACS_UNICODE.get(chr(ch & CHAR_MASK), '?')
+        return ord(glyph), attr | (ch & curses.A_ATTRIBUTES & ~curses.A_ALTCHARSET)
+    return ch & curses.A_CHARTEXT, attr | (ch & curses.A_ATTRIBUTES)
+
+
+class HeadlessWindow:
+    """curses window backed by two flat arrays: codepoints and attributes."""
+
+    def __init__(self, screen, nlines, ncols, begin_y=0, begin_x=0):
+        self.screen = screen
+        self.begin_y, self.begin_x = begin_y, begin_x
+        self.height, self.width = nlines, ncols
+        self.chars = array('I', [BLANK]) * (nlines * ncols)
+        self.attrs = array('L', [0]) * (nlines * ncols)
+        self.cursor = (0, 0)
+        self.delay = True
+        self.calls = 0  # draw calls made on this window
+
+    # ------------------- GEOMETRY ------------------- #
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def getbegyx(self):
+        return self.begin_y, self.begin_x
+
+    def getyx(self):
+        return self.cursor
+
+    def resize(self, nlines, ncols):
+        """Resizes the window, keeping what still fits"""
+        chars = array('I', [BLANK]) * (nlines * ncols)
+        attrs = array('L', [0]) * (nlines * ncols)
+        for y in range(min(nlines, self.height)):
+            n = min(ncols, self.width)
+            chars[y * ncols:y * ncols + n] = self.chars[y * self.width:y * self.width + n]
+            attrs[y * ncols:y * ncols + n] = self.attrs[y * self.width:y * self.width + n]
+        self.height, self.width = nlines, ncols
+        self.chars, self.attrs = chars, attrs
+
+    def mvwin(self, new_y, new_x):
+        self.begin_y, self.begin_x = new_y, new_x
+
+    # ------------------- DRAWING ------------------- #
+    def addstr(self, *args):
+        """addstr([y, x,] str[, attr]), raising curses.error past the end like curses"""
+        y, x, text, attr = self._parse_args(args)
+        self.calls += 1
+        self._check(y, x)
+        for ch in text:
+            if ch == '\n':
+                self._fill(y, x, self.width - x, BLANK, attr)
+                y, x = y + 1, 0
+                if y >= self.height:
+                    raise curses.error("addstr() returned ERR")
+                continue
+            self._put(y, x, ord(ch), attr)
+            x += 1
+            if x >= self.width:
+                y, x = y + 1, 0
+                if y >= self.height:
+                    self.cursor = (self.height - 1, self.width - 1)
+                    raise curses.error("addstr() returned ERR")
+        self.cursor = (y, x)
+
+    def addch(self, *args):
+        """addch([y, x,] ch[, attr])"""
+        y, x, ch, attr = self._parse_args(args)
+        self.calls += 1
+        self._check(y, x)
+        self._put(y, x, *_split_ch(ch, attr))
+        if x + 1 < self.width:
+            self.cursor = (y, x + 1)
+        elif y + 1 < self.height:
+            self.cursor = (y + 1, 0)
+        else:
+            raise curses.error("addch() returned ERR")
+
+    def erase(self):
+        self.calls += 1
+        self._fill(0, 0, self.height * self.width, BLANK, 0)
+        self.cursor = (0, 0)
+
+    def clear(self):
+        self.erase()
+        self.screen.clear_requested = True
+
+    def border(self, ls=0, rs=0, ts=0, bs=0, tl=0, tr=0, bl=0, br=0):
+        """Draws a border, 0 meaning the default line-drawing character"""
+        install_acs()
+        ls = ls or curses.ACS_VLINE
+        rs = rs or curses.ACS_VLINE
+        ts = ts or curses.ACS_HLINE
+        bs = bs or curses.ACS_HLINE
+        h, w = self.height, self.width
+        self.calls += 1
+        for x in range(1, w - 1):
+            self._put(0, x, *_split_ch(ts, 0))
+            self._put(h - 1, x, *_split_ch(bs, 0))
+        for y in range(1, h - 1):
+            self._put(y, 0, *_split_ch(ls, 0))
+            self._put(y, w - 1, *_split_ch(rs, 0))
+        self._put(0, 0, *_split_ch(tl or curses.ACS_ULCORNER, 0))
+        self._put(0, w - 1, *_split_ch(tr or curses.ACS_URCORNER, 0))
+        self._put(h - 1, 0, *_split_ch(bl or curses.ACS_LLCORNER, 0))
+        self._put(h - 1, w - 1, *_split_ch(br or curses.ACS_LRCORNER, 0))
+
+    def box(self, vertch=0, horch=0):
+        self.border(vertch, vertch, horch, horch)
+
+    def touchwin(self):
+        pass  # noutrefresh always copies the whole window
+
+    def noutrefresh(self):
+        """Copies the window onto the screen's virtual buffer"""
+        self.screen._copy_in(self)
+
+    def refresh(self):
+        self.noutrefresh()
+        self.screen.doupdate()
+
+    # ------------------- INPUT ------------------- #
+    def nodelay(self, flag):
+        self.delay = not flag
+
+    def keypad(self, flag):
+        pass
+
+    def getch(self):
+        """Next queued key as an int, or -1 when there is none"""
+        key = self.screen._next_key()
+        if key is None:
+            return -1
+        return ord(key) if isinstance(key, str) else key
+
+    def get_wch(self):
+        """Next queued key as a str or int key code, raising curses.error when there is none"""
+        key = self.screen._next_key()
+        if key is None:
+            raise curses.error("no input")
+        return key
+
+    # ------------------- SNAPSHOTS ------------------- #
+    def text(self):
+        """Window contents as a list of strings"""
+        w = self.width
+        return [''.join(map(chr, self.chars[y * w:(y + 1) * w])) for y in range(self.height)]
+
+    def attr_at(self, y, x):
+        return self.attrs[y * self.width + x]
+
+    # ------------------- HELPERS ------------------- #
+    def _parse_args(self, args):
+        if len(args) in (1, 2):
+            y, x = self.cursor
+            text, attr = args[0], (args[1] if len(args) == 2 else 0)
+        else:
+            y, x, text = args[:3]
+            attr = args[3] if len(args) == 4 else 0
+        return y, x, text, attr or 0
+
+    def _check(self, y, x):
+        if not (0 <= y < self.height and 0 <= x < self.width):
+            raise curses.error("wmove() returned ERR")
+
+    def _put(self, y, x, codepoint, attr):
+        i = y * self.width + x
+        self.chars[i] = codepoint
+        self.attrs[i] = attr
+
+    def _fill(self, y, x, n, codepoint, attr):
+        i = y * self.width + x
+        self.chars[i:i + n] = array('I', [codepoint]) * n
+        self.attrs[i:i + n] = array('L', [attr]) * n
+
+
+class HeadlessScreen:
+    """
+    Virtual terminal: windows are copied onto a virtual buffer by
+    noutrefresh and doupdate copies it onto the physical one, counting
+    the cells and approximate bytes a real terminal would have received.
+    """
+
+    def __init__(self, lines=40, cols=140):
+        self.lines, self.cols = lines, cols
+        self.virtual = HeadlessWindow(self, lines, cols)
+        self.physical = HeadlessWindow(self, lines, cols)
+        self.stdscr = HeadlessWindow(self, lines, cols)
+        self.keys = []
+        self.clear_requested = False
+        # Output stats
+        self.updates = 0
+        self.cells_written = 0
+        self.bytes_written = 0
+
+    def newwin(self, nlines, ncols=0, begin_y=0, begin_x=0):
+        """curses.newwin, where 0 lines or cols extend to the screen edge"""
+        nlines = nlines or self.lines - begin_y
+        ncols = ncols or self.cols - begin_x
+        return HeadlessWindow(self, nlines, ncols, begin_y, begin_x)
+
+    def getmaxyx(self):
+        return self.lines, self.cols
+
+    def resize(self, lines, cols):
+        """Resizes the terminal, like a SIGWINCH followed by resizeterm"""
+        self.lines, self.cols = lines, cols
+        for win in (self.virtual, self.physical, self.stdscr):
+            win.resize(lines, cols)
+        self.push_keys(curses.KEY_RESIZE)
+
+    def push_keys(self, *keys):
+        """Queues keys (str or int codes) for getch/get_wch"""
+        for key in keys:
+            if isinstance(key, str) and len(key) > 1:
+                self.keys.extend(key)
+            else:
+                self.keys.append(key)
+
+    def doupdate(self):
+        """Flushes the virtual buffer onto the physical screen"""
+        self.updates += 1
+        virtual, physical = self.virtual, self.physical
+        if self.clear_requested:
+            physical.erase()
+            self.bytes_written += 4
+            self.clear_requested = False
+
+        w = self.cols
+        for y in range(self.lines):
+            row = slice(y * w, (y + 1) * w)
+            if virtual.chars[row] == physical.chars[row] and virtual.attrs[row] == physical.attrs[row]:
+                continue
+            last_x, last_attr = None, None
+            for x in range(w):
+                i = y * w + x
+                ch, attr = virtual.chars[i], virtual.attrs[i]
+                if ch == physical.chars[i] and attr == physical.attrs[i]:
+                    continue
+                if last_x != x:
+                    self.bytes_written += 8  # cursor move
+                if attr != last_attr:
+                    self.bytes_written += 8  # attribute change
+                self.bytes_written += len(chr(ch).encode('utf-8'))
+                self.cells_written += 1
+                physical.chars[i], physical.attrs[i] = ch, attr
+                last_x, last_attr = x + 1, attr
+
+    def snapshot(self):
+        """Physical screen contents as a list of strings"""
+        return self.physical.text()
+
+    def _copy_in(self, win):
+        """Copies the visible part of a window onto the virtual buffer"""
+        top, left = win.begin_y, win.begin_x
+        for y in range(win.height):
+            sy = top + y
+            if not 0 <= sy < self.lines:
+                continue
+            x0, x1 = max(0, -left), min(win.width, self.cols - left)
+            if x0 >= x1:
+                continue
+            src = slice(y * win.width + x0, y * win.width + x1)
+            dst = slice(sy * self.cols + left + x0, sy * self.cols + left + x1)
+            self.virtual.chars[dst] = win.chars[src]
+            self.virtual.attrs[dst] = win.attrs[src]
+
+    def _next_key(self):
+        return self.keys.pop(0) if self.keys else None
@@ -0,0 +1,102 @@
+import json
+import threading
+import time
+from collections import deque
+
+# Number of samples kept per phase for the rolling percentiles
+WINDOW = 240
+
+
+class _Phase:
+    """Timer for one named phase, reused so timing a block allocates nothing."""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class FrameProfiler:
+    """
+    Collects monotonic timings of named phases (main loop steps, game
+    updates, frame draws) into rolling windows, and optionally streams
+    every sample to a JSONL trace file.
+
+        with profiler.phase('read_key'):
+            key = read_key(...)
+    """
+
+    def __init__(self, window: int = WINDOW):
+        self.window = window
+        self.enabled = True
+        self.overlay = False  # shown in the status window by the perf command
+        self._samples = {}
+        self._phases = {}
+        self._trace = None
+        self._lock = threading.Lock()
+
+    def phase(self, name: str):
+        """Context manager timing the enclosed block as phase name"""
+        timer = self._phases.get(name)
+        if timer is None:
+            timer = self._phases.setdefault(name, _Phase(self, name))
+        return timer
+
+    def record(self, name: str, ns: int):
+        """Adds one sample, in nanoseconds, to a phase"""
+        if not self.enabled:
+            return
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+        samples.append(ns)
+        if self._trace:
+            line = json.dumps({'t': time.monotonic(), 'phase': name, 'us': ns / 1000})
+            with self._lock:
+                if self._trace:
+                    self._trace.write(line + '\n')
+
+    def percentiles(self, name: str):
+        """p50, p95, p99 and max of a phase in milliseconds, or None without samples"""
+        samples = sorted(self._samples.get(name, ()))
+        if not samples:
+            return None
+        last = len(samples) - 1
+        return {
+            'p50': samples[last * 50 // 100] / 1e6,
+            'p95': samples[last * 95 // 100] / 1e6,
+            'p99': samples[last * 99 // 100] / 1e6,
+            'max': samples[last] / 1e6,
+        }
+
+    def summary(self):
+        """Percentiles of every phase, by phase name"""
+        return {name: self.percentiles(name) for name in sorted(self._samples)}
+
+    def start_trace(self, path):
+        """Streams every following sample to a JSONL file"""
+        with self._lock:
+            self._trace = open(path, 'a', buffering=64 * 1024)
+
+    def stop_trace(self):
+        with self._lock:
+            if self._trace:
+                self._trace.close()
+                self._trace = None
+
+    def reset(self):
+        self._samples.clear()
+
+
+# Global instance shared by the main loop, the compositor and its actors
+profiler = FrameProfiler()
@@ -1 +1,4 @@
-from .pet import Pet
\ No newline at end of file
+from .pet import Pet
+from .saver import SaveWorker, saver
+from .store import BinaryStore, JsonStore, SqliteStore, import_json_saves, store
+from .fleet import PetFleet
\ No newline at end of file
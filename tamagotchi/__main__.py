@@ -0,0 +1,63 @@
+# tamagotchi/__main__.py
+"""
+Pet storage tools.
+
+    python -m tamagotchi import-json [--to sqlite|binary] [--db saves/pets.db]
+
+copies every saves/save_<name>.json into the sqlite store, or rewrites
+them as binary saves. Set "backend" in configs/storage.json to the same
+format to play from it.
+
+    python -m tamagotchi events <name>
+
+prints the event log of a pet, dead ones included.
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from .events import NAMES, EventLog
+from .store import BASE_DIR, SAVE_DIR, BinaryStore, SqliteStore, import_json_saves
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tamagotchi", description="Pet storage tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    importer = commands.add_parser("import-json", help="copy the JSON saves into another store")
+    importer.add_argument("--to", choices=["sqlite", "binary"], default="sqlite", help="format to copy them to")
+    importer.add_argument("--db", type=Path, default=BASE_DIR / "saves" / "pets.db", help="sqlite database to fill")
+    events = commands.add_parser("events", help="print the event log of a pet")
+    events.add_argument("name", help="name of the pet")
+    args = parser.parse_args(argv)
+
+    if args.command == "events":
+        return print_events(args.name)
+    if args.to == "binary":
+        target, where = BinaryStore(), "binary saves"
+    else:
+        target, where = SqliteStore(args.db), args.db
+    try:
+        imported, skipped = import_json_saves(target)
+    finally:
+        if args.to == "sqlite":
+            target.close()
+    print(f"Imported {len(imported)} pets into {where}")
+    for name in skipped:
+        print(f"Skipped unreadable save of {name}")
+    return 0
+
+
+def print_events(name):
+    log = EventLog(SAVE_DIR / f"events_{name}.log")
+    if not log.path.exists():
+        print(f"{name} has no event log")
+        return 1
+    for kind, when, values in log.events():
+        date = datetime.fromtimestamp(when).strftime("%m/%d/%Y, %H:%M:%S")
+        shown = ', '.join(f"{value:.2f}" for value in values)
+        print(f"{date}  {NAMES.get(kind, kind):<8}  {shown}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import struct
+from pathlib import Path
+
+# Kinds of events
+SNAPSHOT = 0  # health, fatigue, sleep, experience, resting: the whole state
+REST = 1
+AWAKE = 2
+REWARD = 3    # experience, sleepy and fatigue gained from a game
+AGE = 4       # seconds the pet aged while the game was closed
+DEATH = 5     # 1 if the pet was killed, 0 if its stats killed it
+NAMES = {SNAPSHOT: 'snapshot', REST: 'rest', AWAKE: 'awake', REWARD: 'reward', AGE: 'age', DEATH: 'death'}
+
+# A snapshot is written after this many other events, so a load replays at most that many
+SNAPSHOT_EVERY = 64
+
+
+class EventLog:
+    """
+    Append-only log of everything that changed a pet's stats, in fixed-size
+    binary records of (kind, epoch seconds, five values). A snapshot of the
+    whole state is appended every SNAPSHOT_EVERY events: the latest state
+    is found by reading the log backwards to the last snapshot, and the
+    state at any earlier time by replaying from the snapshot before it, so
+    neither gets slower as the log grows. Records are never rewritten, the
+    log keeps a pet's whole life and outlives its save to tell how it died.
+    """
+
+    MAGIC = b'TPEVLOG1'
+    RECORD = struct.Struct('<Bd5d')
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self._since_snapshot = None  # events after the last snapshot, counted on first use
+
+    def append(self, kind, when, *values):
+        """Records an event at when, epoch seconds"""
+        if self._file is None:
+            self._open()
+        self._file.write(self.RECORD.pack(kind, when, *values, *(0.0,) * (5 - len(values))))
+        self._file.flush()
+        self._since_snapshot = 0 if kind == SNAPSHOT else self._since_snapshot + 1
+
+    def snapshot(self, pet, when, force=False):
+        """Records the whole state of a pet if enough events came since the last snapshot"""
+        if self._file is None:
+            self._open()
+        if force or self._since_snapshot >= SNAPSHOT_EVERY:
+            self.append(SNAPSHOT, when, pet.health, pet.fatigue, pet.sleepy, pet.experience, float(pet.resting))
+
+    def tail(self):
+        """Events from the last snapshot on, oldest first, as (kind, when, values) tuples"""
+        return self.until(float('inf'))
+
+    def until(self, when):
+        """Events from the last snapshot taken by when, epoch seconds, up to when"""
+        events = []
+        for event in self._backwards():
+            if event[1] > when:
+                continue
+            events.append(event)
+            if event[0] == SNAPSHOT:
+                break
+        events.reverse()
+        return events
+
+    def events(self):
+        """Every event of the log, oldest first"""
+        count = self._count()
+        if not count:
+            return
+        with self.path.open('rb') as f:
+            f.seek(len(self.MAGIC))
+            for kind, when, *values in self.RECORD.iter_unpack(f.read(count * self.RECORD.size)):
+                yield kind, when, values
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        self.path.parent.mkdir(exist_ok=True)
+        count = self._count()
+        self._file = self.path.open('ab')
+        if self._file.tell() == 0:
+            self._file.write(self.MAGIC)
+        elif count * self.RECORD.size + len(self.MAGIC) != self._file.tell():
+            # Drop the partial record of a crash mid-write
+            self._file.truncate(count * self.RECORD.size + len(self.MAGIC))
+        if self._since_snapshot is None:
+            tail = self.tail()
+            self._since_snapshot = len(tail) - 1 if tail and tail[0][0] == SNAPSHOT else SNAPSHOT_EVERY
+
+    def _count(self):
+        """Number of whole records in the log"""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        return max(0, size - len(self.MAGIC)) // self.RECORD.size
+
+    def _backwards(self, chunk=SNAPSHOT_EVERY + 1):
+        """Events from the newest, read in chunks from the end of the log"""
+        count = self._count()
+        if not count:
+            return
+        with self.path.open('rb') as f:
+            if f.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError(f"{self.path.name} is not a pet event log")
+            while count:
+                start = max(0, count - chunk)
+                f.seek(len(self.MAGIC) + start * self.RECORD.size)
+                records = list(self.RECORD.iter_unpack(f.read((count - start) * self.RECORD.size)))
+                for kind, when, *values in reversed(records):
+                    yield kind, when, values
+                count = start
+
+
+def replay(pet, events):
+    """Applies logged events to a pet, aging it in between as the game did"""
+    for kind, when, values in events:
+        if kind == SNAPSHOT:
+            pet.health, pet.fatigue, pet.sleepy, pet.experience = values[:4]
+            pet.resting = bool(values[4])
+            pet.last_update = when
+            continue
+        pet.update(when)
+        if kind == REST:
+            pet.resting = True
+        elif kind == AWAKE:
+            pet.resting = False
+        elif kind == REWARD:
+            pet.experience += values[0]
+            pet.sleepy += values[1]
+            pet.fatigue += values[2]
+        elif kind == DEATH:
+            pet.alive = False
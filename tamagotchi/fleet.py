@@ -0,0 +1,119 @@
+import time
+from .pet import Pet
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed to simulate fleets, not to play
+    np = None
+
+
+class PetFleet:
+    """
+    Many pets aged together, stored as one numpy array per stat instead of
+    one Pet object each. age() applies the closed-form aging of Pet.age to
+    every pet at once.
+
+    Pets are loaded from and saved to a store as the (name, properties)
+    pairs of Store.load_all and Store.save_many.
+    """
+
+    def __init__(self, pets=(), now: float = None):
+        """
+        :param pets: (name, properties) pairs, properties as saved by Pet._save_state
+        :param now: epoch seconds given to pets saved without a date
+        """
+        if np is None:
+            raise ImportError("PetFleet requires numpy, install it with 'pip install numpy'")
+        now = time.time() if now is None else now
+        pets = list(pets)
+        self.names = [name for name, _ in pets]
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        def column(key, default, dtype=np.float64):
+            return np.fromiter((properties.get(key, default) for _, properties in pets), dtype, len(pets))
+
+        self.health = column('health', 1)
+        self.fatigue = column('fatigue', 0)
+        self.sleepy = column('sleep', 0)
+        self.experience = column('experience', 0)
+        self.resting = column('resting', False, np.bool_)
+        # Epoch seconds each pet was last aged at
+        self.updated = np.fromiter((properties.get('save_time') or now for _, properties in pets), np.float64, len(pets))
+        self.dead = self._death_condition()
+
+    @classmethod
+    def from_store(cls, store=None, now: float = None):
+        """Fleet of every pet of a store, the configured one by default"""
+        if store is None:
+            from .store import store
+        return cls(store.load_all(), now)
+
+    def __len__(self):
+        return len(self.names)
+
+    def stats(self, name):
+        """Properties of one pet, in the format of Pet._save_state"""
+        return self._properties(self.index[name])
+
+    def age(self, now: float = None):
+        """
+        Ages every living pet up to now, epoch seconds
+
+        :return: names of the pets that died since the last call
+        """
+        now = time.time() if now is None else now
+        alive = ~self.dead
+        elapsed = np.where(alive, np.maximum(now - self.updated, 0), 0)
+
+        # Rest recovery, as Pet.apply_rest_recovery
+        resting = self.resting & alive
+        rest_left = np.maximum(np.maximum(self.sleepy / Pet.REST_SLEEP_RATE, self.fatigue / Pet.REST_FATIGUE_RATE), 0)
+        woken = resting & (elapsed > 0) & (elapsed >= rest_left)
+        recovering = resting & ~woken
+        np.copyto(self.sleepy, np.maximum(0, self.sleepy - Pet.REST_SLEEP_RATE * elapsed), where=recovering)
+        np.copyto(self.fatigue, np.maximum(0, self.fatigue - Pet.REST_FATIGUE_RATE * elapsed), where=recovering)
+        self.sleepy[woken] = 0
+        self.fatigue[woken] = 0
+        self.resting &= ~woken
+        # Time spent awake: all of it, what is left after waking up, or none
+        hours = np.where(woken, elapsed - rest_left, np.where(recovering, 0, elapsed)) / 3600
+
+        # Time degradation, as Pet.apply_time_degradation
+        onset = np.minimum(np.maximum(0, (Pet.HEALTH_DECAY_THRESHOLD - self.fatigue) / Pet.FATIGUE_PER_HOUR),
+                           np.maximum(0, (Pet.HEALTH_DECAY_THRESHOLD - self.sleepy) / Pet.SLEEP_PER_HOUR))
+        decay_hours = np.maximum(0, hours - onset)
+        self.health = np.maximum(np.minimum(self.health, 0.1), self.health - decay_hours * Pet.HEALTH_DECAY_PER_HOUR)
+        self.fatigue = np.maximum(self.fatigue, np.minimum(Pet.MAX_STAT, self.fatigue + hours * Pet.FATIGUE_PER_HOUR))
+        self.sleepy = np.maximum(self.sleepy, np.minimum(Pet.MAX_STAT, self.sleepy + hours * Pet.SLEEP_PER_HOUR))
+        self.experience *= np.exp(-Pet.EXP_DECAY_PER_HOUR * hours)
+
+        self.updated[alive] = now
+        dead = self._death_condition()
+        died = np.flatnonzero(dead & ~self.dead)
+        self.dead = dead | self.dead
+        return [self.names[i] for i in died]
+
+    def save(self, store=None):
+        """
+        Writes every living pet to a store in one batch, dead pets are left
+        for the caller to delete as DeadCommand does
+
+        :return: number of pets written
+        """
+        if store is None:
+            from .store import store
+        return store.save_many((self.names[i], self._properties(i)) for i in np.flatnonzero(~self.dead))
+
+    def _death_condition(self):
+        """Same as Pet.death_condition"""
+        return (self.fatigue > Pet.MAX_STAT) | (self.sleepy > Pet.MAX_STAT) | (self.health == 0)
+
+    def _properties(self, i):
+        return {
+            'health': float(self.health[i]),
+            'fatigue': float(self.fatigue[i]),
+            'sleep': float(self.sleepy[i]),
+            'experience': float(self.experience[i]),
+            'resting': bool(self.resting[i]),
+            'save_time': float(self.updated[i]),
+        }
@@ -1,12 +1,18 @@
 import json
-from datetime import datetime
+import math
+import time
 from pathlib import Path
 import random as rnd
+from .events import AGE, AWAKE, DEATH, REST, REWARD, EventLog, replay
+from .store import store
 
 
 class Pet:
     """A virtual pet with health, fatigue, and sleep mechanics."""
 
+    __slots__ = ('name', 'health', 'fatigue', 'sleepy', 'experience', 'resting', 'alive',
+                 'last_update', 'version', 'store', 'history_path', 'events')
+
     MAX_STAT = 50
     FATIGUE_PER_HOUR = 0.1
     SLEEP_PER_HOUR = 0.15
@@ -26,149 +32,175 @@ class Pet:
         self.experience = 0
         self.resting = False
         self.alive = True
-        self.rest_start_time = None
+        self.last_update = time.time()  # epoch seconds the stats were aged to
+        self.version = 0  # Bumped on every change of the shown stats, so views know when to redraw
         
         # Handle first time load
         base_dir = Path(__file__).resolve().parent.parent
         save_dir = base_dir / "saves"
         save_dir.mkdir(exist_ok=True)
-        self.save_path = save_dir / f"save_{self.name}.json"
+        self.store = store
+        self.history_path = save_dir / f"history_{self.name}.log"
+        self.events = EventLog(save_dir / f"events_{self.name}.log")
         
-        if self.save_path.exists():
-            self._load_state()
-        else:
+        if not self._load_state():
+            self.events.snapshot(self, self.last_update, force=True)
             self._save_state()
-        
-        self.death_condition = self.fatigue > self.MAX_STAT or self.sleepy > self.MAX_STAT or self.health == 0
     
     def delete_save(self): 
-        self.save_path.unlink(missing_ok=True)
+        """Delete the save and command history, the event log is kept to tell how the pet died."""
+        self.store.delete(self.name)
+        self.history_path.unlink(missing_ok=True)
+
+    def die(self, killed=False):
+        """Mark the pet dead, by its stats or killed by the player."""
+        self.update()
+        self.alive = False
+        self.resting = False
+        self.events.append(DEATH, self.last_update, float(killed))
+        self.events.snapshot(self, self.last_update, force=True)
+
+    def rewind(self, when):
+        """Reset the stats to what they were at when, epoch seconds, replaying the event log."""
+        replay(self, self.events.until(when))
+        self.update(when)
+
+    @property
+    def death_condition(self):
+        """True once a stat is past its limit, the pet then dies."""
+        return self.fatigue > self.MAX_STAT or self.sleepy > self.MAX_STAT or self.health == 0
 
     def rest(self):
         """Start resting to recover sleep and fatigue."""
         if not self.resting:
+            self.update()
             self.resting = True
-            self.rest_start_time = datetime.now()
+            self.events.append(REST, self.last_update)
+            self.version += 1
     
     def awake(self):
         """Stop resting."""
-        self.resting = False
-        self.rest_start_time = None
+        if self.resting:
+            self.update()
+            self.resting = False
+            self.events.append(AWAKE, self.last_update)
+            self.version += 1
+
+    def reward(self, experience, sleepy, fatigue):
+        """Apply the outcome of a played game."""
+        self.update()
+        self.events.append(REWARD, self.last_update, experience, sleepy, fatigue)
+        self.experience += experience
+        self.sleepy += sleepy
+        self.fatigue += fatigue
+        self.version += 1
     
     def _save_state(self):
-        """Create or update a save state for the pet."""
-        now = datetime.now().strftime("%m/%d/%Y, %H:%M:%S")
-        state_dict = {
-            self.name: {
-                'properties': {
-                    'health': self.health,
-                    'fatigue': self.fatigue,
-                    'sleep': self.sleepy,
-                    'experience': self.experience,
-                    'resting': self.resting,
-                    'save_date': now
-                }
-            }
-        }
-        
-        with self.save_path.open("w") as f:
-            json.dump(state_dict, f, indent=4)
+        """Create or update a save state for the pet, written in the background."""
+        self.update()
+        self.events.snapshot(self, self.last_update)
+        self.store.save(self.name, {
+            'health': self.health,
+            'fatigue': self.fatigue,
+            'sleep': self.sleepy,
+            'experience': self.experience,
+            'resting': self.resting,
+            'save_time': self.last_update
+        })
     
     def _load_state(self):
-        """Load save state from disk and apply time degradation."""
+        """Load save state from the store and age the pet since, False if there is none."""
         try:
-            with self.save_path.open('r') as f:
-                data = json.load(f)
-            
-            if self.name not in data:
-                print("No save file found, starting fresh.")
-                return
-            
-            props = data[self.name]['properties']
+            props = self.store.load(self.name)
+            if props is None:
+                return False
             
             self.health = props.get('health', 1)
             self.fatigue = props.get('fatigue', 0)
             self.sleepy = props.get('sleep', 0)
             self.experience = props.get('experience', 0)
+            self.resting = bool(props.get('resting', False))
             
-            #  apply time degradation
-            save_date_str = props.get('save_date')
-            if save_date_str:
-                last_save = datetime.strptime(save_date_str, "%m/%d/%Y, %H:%M:%S")
-                                                                    #second per hour
-                hours_elapsed = (datetime.now() - last_save).total_seconds() / 3600
-                
-                # DOES NOT WORK - WIP
-                # If saved when resting then pet recovers
-                #if props.get('resting', 0):
-                #    self.apply_rest_recovery(hours_elapsed)
-                #else: self.apply_time_degradation(hours_elapsed)
-                self.apply_time_degradation(hours_elapsed)
+            # Age the pet over the time the game was closed
+            save_time = props.get('save_time')
+            if save_time:
+                self.last_update = save_time
+            # Events logged after the save was written, e.g. before a crash
+            replay(self, [event for event in self.events.tail() if event[1] > self.last_update])
+            before = (self.fatigue, self.experience, self.sleepy)
+            offline = time.time() - self.last_update
+            self.update()
+            self.events.append(AGE, self.last_update, offline)
+            print(f"Time effects: {self.fatigue - before[0]:+.2f} fatigue, {self.experience - before[1]:+.2f} XP, {self.sleepy - before[2]:+.2f} sleep")
             
             print(f"Loaded state for {self.name}: health={self.health}, fatigue={self.fatigue}, sleep={self.sleepy}, resting = {self.resting}")
             
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             print(f"Error loading save file: {e}. Starting fresh.")
+        return True
+
+    def age(self, seconds):
+        """
+        Age the pet by some seconds in closed form, the same as updating it
+        continuously over that time. A resting pet recovers until both sleep
+        and fatigue reach 0, then wakes up and degrades for the remaining time.
+        """
+        if seconds <= 0:
+            return
+        if self.resting:
+            seconds = self.apply_rest_recovery(seconds)
+        if not self.resting:
+            self.apply_time_degradation(seconds / 3600)
 
-# WIP - Does not work   
-#    def apply_rest_recovery(self, hours_elapsed):
-#        """
-#        Apply recovery while pet is resting (even when game is closed).
-#        - Fatigue decreases
-#        - Sleepiness decreases
-#        - Experience stays the same (no decay while resting)
-#        """
-#
-#        seconds_elapsed = hours_elapsed * 3600
-#        
-#        fatigue_decrease = self.REST_FATIGUE_RATE * seconds_elapsed
-#        self.fatigue = max(0, self.fatigue - fatigue_decrease)
-#        
-#        sleep_decrease = self.REST_SLEEP_RATE * seconds_elapsed
-#        self.sleepy = max(0, self.sleepy - sleep_decrease)
-#        
-#        print(f"Rest recovery: -{fatigue_decrease:.2f} fatigue, -{sleep_decrease:.2f} sleepiness")
+    def apply_rest_recovery(self, seconds):
+        """
+        Apply recovery while pet is resting (even when game is closed).
+        - Fatigue decreases
+        - Sleepiness decreases
+        - Experience and health stay the same
+        Resting ends once both reach 0.
 
+        Returns the seconds left after the rest ended, 0 if still resting.
+        """
+        rest_left = max(0, self.sleepy / self.REST_SLEEP_RATE, self.fatigue / self.REST_FATIGUE_RATE)
+        if seconds < rest_left:
+            self.sleepy = max(0, self.sleepy - self.REST_SLEEP_RATE * seconds)
+            self.fatigue = max(0, self.fatigue - self.REST_FATIGUE_RATE * seconds)
+            return 0
+        self.sleepy = self.fatigue = 0
+        self.resting = False
+        return seconds - rest_left
 
     def apply_time_degradation(self, hours_elapsed):
         """
-        Apply time-based changes to pet properties.
-        - Fatigue increases over time
-        - Experience decays slightly
-        - Sleepiness increases
+        Apply time-based changes to an awake pet.
+        - Fatigue and sleepiness increase, up to MAX_STAT
+        - Experience decays exponentially
+        - Health slowly decreases (down to 0.1) once very fatigued or sleepy
         """
+        # Hours until fatigue or sleepiness passes the threshold, they only grow from here
+        onset = min(max(0, (self.HEALTH_DECAY_THRESHOLD - self.fatigue) / self.FATIGUE_PER_HOUR),
+                    max(0, (self.HEALTH_DECAY_THRESHOLD - self.sleepy) / self.SLEEP_PER_HOUR))
+        decay_hours = max(0, hours_elapsed - onset)
+        self.health = max(min(self.health, 0.1), self.health - decay_hours * self.HEALTH_DECAY_PER_HOUR)
 
-        fatigue_increase = min(hours_elapsed * self.FATIGUE_PER_HOUR, self.MAX_STAT - self.fatigue)
-        self.fatigue += fatigue_increase
-        
-        exp_decay = self.experience * (hours_elapsed * self.EXP_DECAY_PER_HOUR)
-        self.experience = max(0, self.experience - exp_decay)
-        
-        sleep_increase = min(hours_elapsed * self.SLEEP_PER_HOUR, self.MAX_STAT - self.sleepy)
-        self.sleepy += sleep_increase
-        
-        # Health slowly decreases if very fatigued or sleepy
-        if self.fatigue > self.HEALTH_DECAY_THRESHOLD or self.sleepy > self.HEALTH_DECAY_THRESHOLD:
-            health_decay = hours_elapsed * self.HEALTH_DECAY_PER_HOUR
-            self.health = max(0.1, self.health - health_decay)
-        
-        print(f"Time effects: +{fatigue_increase:.2f} fatigue, -{exp_decay:.2f} XP, +{sleep_increase:.2f} sleep")
+        self.fatigue = max(self.fatigue, min(self.MAX_STAT, self.fatigue + hours_elapsed * self.FATIGUE_PER_HOUR))
+        self.sleepy = max(self.sleepy, min(self.MAX_STAT, self.sleepy + hours_elapsed * self.SLEEP_PER_HOUR))
+        self.experience *= math.exp(-self.EXP_DECAY_PER_HOUR * hours_elapsed)
     
-    def update(self):
-        """Update pet state based on elapsed time since last rest check."""
-        if self.resting:
-            now = datetime.now()
-            elapsed = (now - self.rest_start_time).total_seconds()
-            
-            self.sleepy -= self.REST_SLEEP_RATE * elapsed
-            self.sleepy = max(0, round(self.sleepy, 3))
-            
-            self.fatigue = max(0, round(self.fatigue - self.REST_FATIGUE_RATE * elapsed, 3))
-            
-            self.rest_start_time = now
-            
-            if self.sleepy == 0 and self.fatigue == 0:
-                self.resting = False
+    def update(self, now=None):
+        """Age the pet from its last update to now, epoch seconds defaulting to the current time."""
+        now = now or time.time()
+        shown = self._shown()
+        self.age(now - self.last_update)
+        self.last_update = now
+        if self._shown() != shown:
+            self.version += 1
+
+    def _shown(self):
+        """Stats as displayed, the version only changes with these"""
+        return (round(self.health, 1), round(self.fatigue, 1), round(self.sleepy, 1),
+                round(self.experience, 1), self.resting)
     
     def __str__(self):
         return f"""Monster's Name: {self.name} \n
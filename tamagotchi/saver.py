@@ -0,0 +1,133 @@
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from render import profiler
+
+
+class SaveWorker:
+    """
+    Write-behind saver. save() only records the latest state of a file, a
+    background thread writes it at most once per flush interval. JSON files
+    are written through a temporary file that is fsynced and renamed over
+    the save, so a crash leaves the old or the new save on disk, never a
+    truncated one. Other formats pass their own write function.
+
+    Time spent in save() and in each write is recorded as the save.request
+    and save.write profiler phases.
+    """
+
+    def __init__(self, flush_interval: float = None):
+        self.flush_interval = flush_interval
+        self.writes = 0
+        self.coalesced = 0  # states replaced by a newer one before being written
+        self.last_error = None  # latest failed write, until flush() reports it
+        self._pending = {}  # key -> (write function, latest state)
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._thread = None
+
+    def save(self, key, data, write=None):
+        """
+        Queues data to be written
+
+        :param key: what is saved, a newer save with the same key replaces a pending one
+        :param data: the state to write
+        :param write: function called as write(key, data) on the saver thread,
+            by default writes data as the JSON content of the file at path key
+        """
+        start = time.perf_counter_ns()
+        with self._cond:
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = (write or write_json, data)
+            if self._thread is None:
+                self._start()
+            self._cond.notify()
+        profiler.record('save.request', time.perf_counter_ns() - start)
+
+    def discard(self, key):
+        """Drops a pending write and waits out one in progress, before the save is deleted"""
+        with self._io_lock:
+            with self._cond:
+                self._pending.pop(key, None)
+
+    def flush(self):
+        """
+        Writes every pending save now, in the calling thread
+
+        :return: the latest error a write raised since the last flush, or None
+        """
+        self._write_pending()
+        with self._cond:
+            error, self.last_error = self.last_error, None
+        return error
+
+    def _start(self):
+        if self.flush_interval is None:
+            from configs.config_loader import config
+            self.flush_interval = config.get_save_interval()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            # Let newer states of the same pet replace this one meanwhile
+            time.sleep(self.flush_interval)
+            self._write_pending()
+
+    def _write_pending(self):
+        with self._io_lock:
+            with self._cond:
+                pending, self._pending = self._pending, {}
+            for key, (write, data) in pending.items():
+                start = time.perf_counter_ns()
+                try:
+                    write(key, data)
+                    self.writes += 1
+                except Exception as e:  # a failed save must not kill the saver thread
+                    with self._cond:
+                        self.last_error = e
+                profiler.record('save.write', time.perf_counter_ns() - start)
+
+
+def write_json(path, data):
+    """Atomically replaces the file at path with data as indented JSON"""
+    write_bytes(path, json.dumps(data, indent=4).encode())
+
+
+def write_bytes(path, data):
+    """Atomically replaces the file at path with data"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        with tmp_path.open('wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory):
+    """Makes a rename durable, directories cannot be opened on Windows"""
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Global instance writing every pet's save
+saver = SaveWorker()
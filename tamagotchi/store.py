@@ -0,0 +1,323 @@
+import json
+import sqlite3
+import struct
+import threading
+from datetime import datetime
+from pathlib import Path
+from .saver import saver, write_bytes, write_json
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SAVE_DIR = BASE_DIR / "saves"
+
+# Columns of a pet's saved properties, in the order of the sqlite table,
+# save_time is in epoch seconds
+PROPERTIES = ('health', 'fatigue', 'sleep', 'experience', 'resting', 'save_time')
+# Values of properties missing from old saves, same as Pet._load_state
+DEFAULTS = {'health': 1, 'fatigue': 0, 'sleep': 0, 'experience': 0, 'resting': False, 'save_time': None}
+# Format of the save_date strings of saves older than save_time
+DATE_FORMAT = "%m/%d/%Y, %H:%M:%S"
+
+
+def upgrade_properties(properties):
+    """
+    Replaces the save_date string of an old save with its save_time
+
+    :raises ValueError: if the date cannot be parsed
+    """
+    if 'save_time' not in properties:
+        save_date = properties.pop('save_date', None)
+        properties['save_time'] = datetime.strptime(save_date, DATE_FORMAT).timestamp() if save_date else None
+    return properties
+
+
+class JsonStore:
+    """
+    One indented JSON file per pet, saves/save_<name>.json, the original
+    format. Properties are dicts with the keys of PROPERTIES.
+    """
+
+    def __init__(self, save_dir=SAVE_DIR):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(exist_ok=True)
+
+    def path(self, name):
+        return self.save_dir / f"save_{name}.json"
+
+    def names(self):
+        """Names of the saved pets"""
+        return sorted(f.stem.replace("save_", "", 1) for f in self.save_dir.glob("save_*.json"))
+
+    def load(self, name):
+        """
+        Saved properties of a pet, or None if it has no save
+
+        :raises ValueError: if the save is unreadable (json.JSONDecodeError is one)
+        """
+        path = self.path(name)
+        if not path.exists():
+            return None
+        with path.open('r') as f:
+            data = json.load(f)
+        if name not in data:
+            raise ValueError(f"{path.name} holds no pet named {name}")
+        return upgrade_properties(data[name]['properties'])
+
+    def load_all(self):
+        """(name, properties) of every readable save"""
+        for name in self.names():
+            try:
+                properties = self.load(name)
+            except ValueError:
+                continue
+            if properties is not None:
+                yield name, properties
+
+    def save(self, name, properties):
+        """Queues the properties of a pet on the background saver"""
+        saver.save(self.path(name), {name: {'properties': properties}})
+
+    def save_many(self, pets):
+        """Writes (name, properties) pairs right away, in the calling thread"""
+        count = 0
+        for name, properties in pets:
+            write_json(self.path(name), {name: {'properties': properties}})
+            count += 1
+        return count
+
+    def delete(self, name):
+        path = self.path(name)
+        saver.discard(path)
+        path.unlink(missing_ok=True)
+
+
+class SqliteStore:
+    """
+    Every pet as one row of a sqlite table keyed by name, so loading a pet
+    is a single index lookup however many pets there are. The database runs
+    in WAL mode, and writes go through the background saver like JSON saves.
+    PRAGMA user_version holds the schema version.
+    """
+
+    VERSION = 1
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pets (
+            name TEXT PRIMARY KEY,
+            health REAL NOT NULL,
+            fatigue REAL NOT NULL,
+            sleep REAL NOT NULL,
+            experience REAL NOT NULL,
+            resting INTEGER NOT NULL DEFAULT 0,
+            save_time REAL
+        ) WITHOUT ROWID
+    """
+    SELECT = "SELECT health, fatigue, sleep, experience, resting, save_time FROM pets WHERE name = ?"
+    UPSERT = """
+        INSERT INTO pets (name, health, fatigue, sleep, experience, resting, save_time)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            health = excluded.health, fatigue = excluded.fatigue, sleep = excluded.sleep,
+            experience = excluded.experience, resting = excluded.resting, save_time = excluded.save_time
+    """
+
+    def __init__(self, path=SAVE_DIR / "pets.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(exist_ok=True)
+        # Shared by the game and the saver thread, serialized by the lock
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            version, = self._db.execute("PRAGMA user_version").fetchone()
+            tables = self._db.execute("SELECT count(*) FROM sqlite_master WHERE name = 'pets'").fetchone()[0]
+            if tables and version < 1:
+                self._migrate_save_dates()
+            self._db.execute(self.SCHEMA)
+            self._db.execute(f"PRAGMA user_version = {self.VERSION}")
+
+    def names(self):
+        """Names of the saved pets, read in order from the primary key index"""
+        with self._lock:
+            return [name for name, in self._db.execute("SELECT name FROM pets ORDER BY name")]
+
+    def load(self, name):
+        """Saved properties of a pet, or None if it has no save"""
+        with self._lock:
+            row = self._db.execute(self.SELECT, (name,)).fetchone()
+        if row is None:
+            return None
+        properties = dict(zip(PROPERTIES, row))
+        properties['resting'] = bool(properties['resting'])
+        return properties
+
+    def load_all(self):
+        """(name, properties) of every pet, read in a single query"""
+        with self._lock:
+            rows = self._db.execute(f"SELECT name, {', '.join(PROPERTIES)} FROM pets").fetchall()
+        for name, *row in rows:
+            properties = dict(zip(PROPERTIES, row))
+            properties['resting'] = bool(properties['resting'])
+            yield name, properties
+
+    def save(self, name, properties):
+        """Queues the properties of a pet on the background saver"""
+        saver.save((self.path, name), properties, self._write)
+
+    def save_many(self, pets):
+        """Writes (name, properties) pairs in one transaction, right away"""
+        rows = [(name, *(properties.get(key, DEFAULTS[key]) for key in PROPERTIES)) for name, properties in pets]
+        with self._lock, self._db:
+            self._db.executemany(self.UPSERT, rows)
+        return len(rows)
+
+    def delete(self, name):
+        saver.discard((self.path, name))
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM pets WHERE name = ?", (name,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _write(self, key, properties):
+        self.save_many([(key[1], properties)])
+
+    def _migrate_save_dates(self):
+        """Version 0 stored save_date strings, converts them to save_time"""
+        self._db.execute("ALTER TABLE pets ADD COLUMN save_time REAL")
+        rows = self._db.execute("SELECT name, save_date FROM pets").fetchall()
+        self._db.executemany("UPDATE pets SET save_time = ? WHERE name = ?",
+                             [(upgrade_properties({'save_date': date})['save_time'], name) for name, date in rows])
+        self._db.execute("ALTER TABLE pets DROP COLUMN save_date")
+
+
+class BinaryStore:
+    """
+    One fixed-size binary record per pet, saves/save_<name>.pet: a magic
+    number and format version followed by the stats and the save time in
+    epoch seconds. Pets that only have a JSON save are read from it, and
+    move to the binary format the next time they are saved.
+    """
+
+    MAGIC = b'TPET'
+    VERSION = 1
+    HEADER = struct.Struct('<4sH')
+    # Version 1: resting, then health, fatigue, sleep, experience and save time
+    RECORD = struct.Struct('<4sH?x5d')
+
+    def __init__(self, save_dir=SAVE_DIR):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(exist_ok=True)
+        self.json = JsonStore(save_dir)
+
+    def path(self, name):
+        return self.save_dir / f"save_{name}.pet"
+
+    def names(self):
+        """Names of the saved pets, in either format"""
+        names = {f.stem.replace("save_", "", 1) for f in self.save_dir.glob("save_*.pet")}
+        return sorted(names.union(self.json.names()))
+
+    def load(self, name):
+        """
+        Saved properties of a pet, or None if it has no save
+
+        :raises ValueError: if the save is unreadable
+        """
+        try:
+            data = self.path(name).read_bytes()
+        except FileNotFoundError:
+            return self.json.load(name)
+        return self.unpack(data)
+
+    def load_all(self):
+        """(name, properties) of every readable save"""
+        for name in self.names():
+            try:
+                properties = self.load(name)
+            except ValueError:
+                continue
+            if properties is not None:
+                yield name, properties
+
+    def save(self, name, properties):
+        """Queues the properties of a pet on the background saver"""
+        saver.save(self.path(name), self.pack(properties), write_bytes)
+
+    def save_many(self, pets):
+        """Writes (name, properties) pairs right away, in the calling thread"""
+        count = 0
+        for name, properties in pets:
+            write_bytes(self.path(name), self.pack(properties))
+            count += 1
+        return count
+
+    def delete(self, name):
+        path = self.path(name)
+        saver.discard(path)
+        path.unlink(missing_ok=True)
+        self.json.delete(name)
+
+    @classmethod
+    def pack(cls, properties):
+        """Record of the current version holding properties"""
+        values = [properties.get(key, DEFAULTS[key]) for key in PROPERTIES]
+        *stats, resting, save_time = values
+        return cls.RECORD.pack(cls.MAGIC, cls.VERSION, resting, *stats, save_time or 0.0)
+
+    @classmethod
+    def unpack(cls, data):
+        """
+        Properties stored in a record of any known version
+
+        :raises ValueError: if data is not a record
+        """
+        if len(data) < cls.HEADER.size:
+            raise ValueError("truncated pet save")
+        magic, version = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("not a pet save")
+        if version != 1 or len(data) != cls.RECORD.size:
+            raise ValueError(f"unsupported pet save version {version}")
+        _, _, resting, health, fatigue, sleep, experience, save_time = cls.RECORD.unpack(data)
+        return {'health': health, 'fatigue': fatigue, 'sleep': sleep, 'experience': experience,
+                'resting': resting, 'save_time': save_time or None}
+
+
+def import_json_saves(target, source=None):
+    """
+    Copies every JSON save into another store, e.g. a new SqliteStore
+
+    :return: names of the imported pets, and of the unreadable saves skipped
+    """
+    source = source or JsonStore()
+    pets, skipped = [], []
+    for name in source.names():
+        try:
+            properties = source.load(name)
+        except ValueError:
+            skipped.append(name)
+            continue
+        if properties is not None:
+            pets.append((name, properties))
+    target.save_many(pets)
+    return [name for name, _ in pets], skipped
+
+
+def open_store(storage=None):
+    """Store selected by the "backend" entry of storage.json: "json" (default), "binary" or "sqlite" """
+    if storage is None:
+        from configs.config_loader import config
+        storage = config.storage
+    backend = storage.get('backend', 'json')
+    if backend == 'sqlite':
+        return SqliteStore(BASE_DIR / storage.get('sqlite_path', 'saves/pets.db'))
+    if backend == 'binary':
+        return BinaryStore()
+    if backend == 'json':
+        return JsonStore()
+    raise ValueError(f"Unknown storage backend '{backend}' in storage.json")
+
+
+# Global instance every pet loads from and saves to
+store = open_store()
@@ -1,3 +1,5 @@
 # utils/__init__.py
 from .game_utils import *
-from .ui_utils import *
\ No newline at end of file
+from .ui_utils import *
+from .history import CommandHistory
+from .async_runtime import run_async_game_loop
\ No newline at end of file
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+import time
+from render import compositor, profiler
+from .game_utils import *
+from .layout import layout_engine
+
+# Seconds between saves of the pet while the game runs
+AUTOSAVE_INTERVAL = 60
+# Polling period of stdin where the event loop cannot watch it (Windows)
+POLL_INTERVAL = 0.01
+
+
+class AsyncRuntime:
+    """
+    Runs the game on a single asyncio loop instead of the render thread:
+    the compositor, stdin, pet updates and autosaves are tasks woken by
+    their deadlines or by input, and the welcome and death animations
+    await instead of blocking.
+    """
+
+    def __init__(self, state: TerminalState, stdscr):
+        self.state = state
+        self.stdscr = stdscr
+        self.input_ready = asyncio.Event()
+
+    async def run(self):
+        """Plays until the game quits or the pet dies, returns the final state"""
+        tasks = [asyncio.create_task(compositor.run_async())]
+        try:
+            await self.startup()
+            tasks += [asyncio.create_task(task) for task in (self.read_input(), self.tick_pet(), self.autosave())]
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()  # re-raise errors of the task that ended
+            if not self.state.pet.alive:
+                # Let the death animation play
+                await asyncio.sleep(DEATH_DELAY)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return self.state
+
+    async def startup(self):
+        """Executes welcome animation and back to idle"""
+        self.state.anim = execute_command("fire", self.state)
+        await asyncio.sleep(STARTUP_DELAY)
+        end_startup_animation(self.state)
+        self.refresh()
+
+    async def read_input(self):
+        """Handles every key available each time stdin becomes readable"""
+        loop = asyncio.get_running_loop()
+        fd = sys.stdin.fileno()
+        try:
+            loop.add_reader(fd, self.input_ready.set)
+        except (NotImplementedError, ValueError, OSError):
+            fd = None
+        try:
+            while self.state.running:
+                if fd is None:
+                    await asyncio.sleep(POLL_INTERVAL)
+                else:
+                    await self.input_ready.wait()
+                    self.input_ready.clear()
+                while self.state.running:
+                    with profiler.phase('loop.read_key'):
+                        key = read_key(self.stdscr, self.state.windows['input'], self.state.cmd, self.state.anim)
+                    if key is None:
+                        break
+                    self.handle(key)
+                self.refresh()
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+
+    async def tick_pet(self):
+        """Updates the pet every PET_UPDATE_INTERVAL, which may put it to sleep or kill it"""
+        while True:
+            with profiler.phase('loop.pet_update'):
+                self.state.pet.update()
+            self.handle(None)
+            if not self.state.running:
+                return
+            self.refresh()
+            await asyncio.sleep(PET_UPDATE_INTERVAL)
+
+    async def autosave(self):
+        while self.state.running:
+            await asyncio.sleep(AUTOSAVE_INTERVAL)
+            if self.state.pet.alive:
+                self.state.pet._save_state()
+
+    def handle(self, key):
+        handle_key(self.state, key)
+        if layout_engine.deadline is not None:
+            asyncio.get_running_loop().call_later(max(0.0, layout_engine.deadline - time.monotonic()), self.relayout)
+
+    def relayout(self):
+        """Applies a debounced resize once it is due"""
+        if layout_engine.resize_due(time.monotonic()):
+            with profiler.phase('loop.resize'):
+                handle_resize(self.stdscr, self.state)
+            self.refresh()
+
+    def refresh(self):
+        """Queues redraws of the panels that changed"""
+        with profiler.phase('loop.panels'):
+            request_panels(self.state)
+
+
+def run_async_game_loop(state: TerminalState, stdscr):
+    """Asyncio counterpart of run_game_loop, selected with --runtime asyncio"""
+    return asyncio.run(AsyncRuntime(state, stdscr).run())
@@ -1,18 +1,29 @@
 # ------------------- GAME STATE ------------------- #
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import partial
 from typing import Any
-from pathlib import Path
-from tamagotchi import Pet
+from tamagotchi import Pet, store, saver
 from commands import execute_command, COMMANDS
+from animations import Animation
 from games.game import Game
+from render import compositor, profiler
 from .ui_utils import *
+from .history import CommandHistory
+from .layout import layout_engine
 
 # Change this to update the game's difficulty! 
 SLEEP_THRESHOLD = 20 
 GAME_SLEEPY_INCREASE = 5
 GAME_FATIGUE_INCREASE = 5
 
+# Seconds between pet updates, and longest wait for input (bounds resize latency)
+PET_UPDATE_INTERVAL = 0.5
+MAX_INPUT_WAIT = 0.25
+# Seconds the welcome and death animations play before moving on
+STARTUP_DELAY = 3
+DEATH_DELAY = 2
+
 @dataclass
 class TerminalState:
     pet: Pet
@@ -20,16 +31,20 @@ class TerminalState:
     cmd: str
     windows: dict
     too_small: bool
-    history: list
+    history: CommandHistory
     running: bool = True
+    search: Any = None  # reverse search query, None when not searching
+    drawn: dict = field(default_factory=dict)  # panel -> key of what it last showed
 
 # ------------------- STATE HANDLERS ------------------- #
 def handle_death(state: TerminalState):
-    """Checks if pet is dead and triggers death animation"""
+    """
+    Checks if pet is dead and triggers death animation, the caller lets it
+    play for DEATH_DELAY seconds before exiting
+    """
     if state.pet.death_condition or state.cmd == "kill":
-        state.pet.alive = False
+        state.pet.die(killed=state.cmd == "kill")
         state.anim = execute_command("kill", state)
-        time.sleep(2)
         state.running = False
         return True
     return False
@@ -45,11 +60,11 @@ def handle_sleep(state: TerminalState):
 def handle_game_input(state: TerminalState, key):
     """Separates sub-gameplay input with command execution"""
     if isinstance(state.anim, Game):
-        result = state.anim.handle_game_input(key, state.windows["pet"], state.pet)
+        # Keys change the game, which the compositor may be ticking or drawing
+        with compositor.lock:
+            result = state.anim.handle_game_input(key, state.windows["pet"], state.pet)
         if result:
-            state.pet.experience += state.anim.stop() 
-            state.pet.sleepy += GAME_SLEEPY_INCREASE
-            state.pet.fatigue += GAME_FATIGUE_INCREASE
+            state.pet.reward(state.anim.stop(), GAME_SLEEPY_INCREASE, GAME_FATIGUE_INCREASE)
             state.anim = execute_command("idle", state)
             return True
     return False
@@ -60,7 +75,41 @@ def handle_command(state: TerminalState):
         state.anim = execute_command(state.cmd, state)
         if COMMANDS[state.cmd].name in ["quit", "kill"]:
             state.running = False
+        else:
+            state.pet._save_state()
+
+
+def handle_history_keys(state: TerminalState, key):
+    """
+    Up/down recall and Ctrl-R reverse search in the C:> prompt
 
+    :return: True if the key was used
+    """
+    history = state.history
+    if key == curses.KEY_UP:
+        state.search = None
+        state.cmd = history.previous(state.cmd)
+    elif key == curses.KEY_DOWN:
+        state.search = None
+        state.cmd = history.next(state.cmd)
+    elif key == "\x12":
+        if state.search is None:
+            state.search, state.cmd = "", ""
+        else:
+            # Repeated Ctrl-R steps to the next older match
+            state.cmd = history.search(state.search, older_than=state.cmd) or state.cmd
+    elif key == "\x1b":
+        state.search, state.cmd = None, ""
+        history.reset_recall()
+    elif state.search is not None and key == "\x7f":
+        state.search = state.search[:-1]
+        state.cmd = history.search(state.search) or "" if state.search else ""
+    elif state.search is not None and isinstance(key, str) and key.isprintable():
+        state.search += key.lower()
+        state.cmd = history.search(state.search) or ""
+    else:
+        return False
+    return True
 
 def draw_legend(win: curses.window):
     """Displays available commands"""
@@ -72,56 +121,114 @@ def draw_legend(win: curses.window):
             win.addstr(i, 2, f"- {cmd}: {COMMANDS[cmd].description}")
     win.noutrefresh()
 
+def perf_notes(state: TerminalState):
+    """Lines the perf overlay shows under the timings"""
+    notes = []
+    if isinstance(state.anim, Animation):
+        stats = state.anim.stats()
+        notes.append(f"anim {stats['fps']}fps: {stats['drawn']} drawn, "
+                     f"{stats['dropped']} dropped, {stats['late']} late")
+    if saver.last_error is not None:
+        notes.append(f"save failed: {saver.last_error}")
+    if compositor.last_error is not None:
+        notes.append(f"render error: {compositor.last_error!r}")
+    return notes
+
+def request_panels(state: TerminalState):
+    """Queues redraws of the panels whose content changed since they were last drawn"""
+    if state.too_small:
+        return
+    panels = {
+        'input': ((state.cmd, state.search),
+                  partial(handle_input_window, state.windows['input'], state.cmd, state.max_x, state.search)),
+        'history': (state.history.seq, partial(draw_history, state.history.last(5), state.windows, state.max_x)),
+        'legend': (tuple(COMMANDS), partial(draw_legend, state.windows["legend"])),
+    }
+    if profiler.overlay:
+        # Timings change every frame, the overlay is redrawn whenever the loop runs
+        panels['status'] = (object(), partial(display_perf, state.windows["status"], profiler, perf_notes(state)))
+    else:
+        panels['status'] = (state.pet.version, partial(display_pet, state.windows["status"], state.pet))
+
+    for name, (key, draw) in panels.items():
+        if state.drawn.get(name) != key:
+            state.drawn[name] = key
+            compositor.request(name, draw)
+
+def handle_key(state: TerminalState, key):
+    """
+    Feeds one key, or None when there is none, to the running game, the
+    prompt and the commands
+    """
+    # --- HANDLE RESIZE FIRST (once a burst of resize events is over) ---
+    if key == curses.KEY_RESIZE: layout_engine.request_resize(time.monotonic())
+
+    with profiler.phase('loop.game_input'):
+        if handle_game_input(state, key):
+            return
+
+    if key == "\n" or handle_sleep(state):
+        state.search = None
+        if handle_death(state): return
+        with profiler.phase('loop.command'):
+            handle_command(state)
+        if state.cmd:
+            state.history.append(state.cmd)
+        state.cmd = ""
+        
+    elif not isinstance(state.anim, Game) and handle_history_keys(state, key):
+        pass
+
+    elif key == "\x7f": # Delete char
+        state.cmd = state.cmd[:-1]
+
+    elif isinstance(key, str) and key.isprintable():
+        state.cmd += key.lower()
+
 def run_game_loop(state: TerminalState, stdscr):
     """
     Main game loop. Handles input, terminal updates and refreshes
     """
     on_startup_animation(state)
+    next_pet_update = time.monotonic()
     while state.running:
         # --- INPUT ---
-        handle_input_window(state.windows['input'], state.cmd, state.max_x)
-        key = read_key(stdscr, state.windows['input'], state.cmd, state.anim)
+        with profiler.phase('loop.read_key'):
+            key = read_key(stdscr, state.windows['input'], state.cmd, state.anim)
+        handle_key(state, key)
+        if not state.pet.alive:
+            time.sleep(DEATH_DELAY)
+            break
+    
+        now = time.monotonic()
+        if layout_engine.resize_due(now):
+            with profiler.phase('loop.resize'):
+                handle_resize(stdscr, state)
 
-        # --- HANDLE RESIZE FIRST ---
-        if key == curses.KEY_RESIZE: handle_resize(stdscr, state)
+        # --- RENDER (drawn and flushed by the compositor) ---
+        with profiler.phase('loop.panels'):
+            request_panels(state)
 
-        if  handle_game_input(state, key):
-            continue
+        if now >= next_pet_update:
+            with profiler.phase('loop.pet_update'):
+                state.pet.update()
+            next_pet_update = now + PET_UPDATE_INTERVAL
 
-        if key == "\n" or handle_sleep(state):
-            if handle_death(state): break
-            handle_command(state)
-            if state.cmd:
-                handle_history(
-                    state.cmd,
-                    state.history,
-                    state.windows,
-                    state.max_x
-                )
-            state.cmd = ""
-            
-        elif key == "\x7f": # Delete char
-            state.cmd = state.cmd[:-1]
-
-        elif isinstance(key, str) and key.isprintable():
-            state.cmd += key.lower()
-    
-        # --- RENDER (SAFE) ---
-        try:
-            display_pet(state.windows["status"], state.pet)
-            draw_legend(state.windows["legend"])
-            curses.doupdate()
-        except curses.error:
-            pass
-
-        state.pet.update()
-        time.sleep(0.01)
+        # Sleep until a key arrives or the pet or a resize is due, keys already queued are read right away
+        if key is None:
+            timeout = min(next_pet_update - now, MAX_INPUT_WAIT)
+            if layout_engine.deadline is not None:
+                timeout = min(timeout, layout_engine.deadline - now)
+            wait_for_input(timeout)
     return state
 
 def on_startup_animation(state: TerminalState):
     """Executes welcome animation and back to idle"""
     state.anim = execute_command("fire", state)
-    time.sleep(3)
+    time.sleep(STARTUP_DELAY)
+    end_startup_animation(state)
+
+def end_startup_animation(state: TerminalState):
     state.anim.stop()
     state.anim = execute_command("idle", state)
 
@@ -135,15 +242,12 @@ def get_pet_name():
     print("Welcome to Tamagotchi!")
     print("=" * 40)
     print("Your pets | \n          V   ")
-    # ------------------- PATH SETUP ------------------- #
-    BASE_DIR = Path(__file__).resolve().parent.parent
-    SAVE_DIR = BASE_DIR / "saves"
-    SAVE_DIR.mkdir(exist_ok=True)
 
     # Prints instantiated pets
-    if SAVE_DIR.exists() and any(SAVE_DIR.glob("save_*.json")):
-        for f in SAVE_DIR.glob("save_*.json"):
-            print(f.stem.replace("save_", ""))
+    names = store.names()
+    if names:
+        for name in names:
+            print(name)
     else: print("You have None!")
 
     while True:
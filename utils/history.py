@@ -0,0 +1,146 @@
+import os
+from collections import deque
+from itertools import islice
+from pathlib import Path
+
+# Commands kept in memory, older ones are dropped from the ring and the file
+HISTORY_SIZE = 1000
+# The file is rewritten with the last HISTORY_SIZE commands once it is this many times larger
+COMPACT_FACTOR = 4
+
+
+class CommandHistory:
+    """
+    Bounded command history of a pet, persisted in an append-only file
+    that is only read the first time the history is used.
+
+    Up/down recall walks the ring buffer, reverse search walks an index of
+    distinct commands ordered by last use, so neither depends on how many
+    commands were typed.
+    """
+
+    def __init__(self, path, capacity: int = HISTORY_SIZE):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.seq = 0  # commands appended this session, lets views detect changes
+        self._entries = None
+        self._counts = {}  # command -> occurrences in the ring
+        self._recent = {}  # distinct command -> sequence number of its last use, oldest first
+        self._next_id = 0
+        self._cursor = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def entries(self):
+        """The ring buffer, loaded from the file on first use"""
+        if self._entries is None:
+            self._load()
+        return self._entries
+
+    def append(self, cmd: str):
+        """Records a command in memory and at the end of the history file"""
+        self._push(cmd)
+        self.seq += 1
+        self._cursor = None
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(cmd + '\n')
+        except OSError:
+            pass  # history is a convenience, never worth crashing the game for
+
+    def last(self, n: int):
+        """The n most recent commands, oldest first"""
+        entries = self.entries
+        return list(islice(entries, max(0, len(entries) - n), None))
+
+    # ------------------- RECALL ------------------- #
+    def previous(self, current: str = ''):
+        """Steps back to the previous different command (up arrow)"""
+        entries = self.entries
+        i = len(entries) if self._cursor is None else self._cursor
+        while i > 0:
+            i -= 1
+            if entries[i] != current:
+                self._cursor = i
+                return entries[i]
+        return current
+
+    def next(self, current: str = ''):
+        """Steps forward to the next different command, or the empty line past the newest (down arrow)"""
+        if self._cursor is None:
+            return current
+        entries = self.entries
+        i = self._cursor
+        while i < len(entries) - 1:
+            i += 1
+            if entries[i] != current:
+                self._cursor = i
+                return entries[i]
+        self._cursor = None
+        return ''
+
+    def reset_recall(self):
+        self._cursor = None
+
+    def search(self, query: str, older_than: str = None):
+        """
+        Most recently used command containing query, or None
+
+        :param query: text to look for
+        :param older_than: only consider commands last used before this one,
+            to step to the next match like a repeated Ctrl-R
+        """
+        if self._entries is None:
+            self._load()
+        limit = self._recent.get(older_than, float('inf'))
+        for cmd in reversed(self._recent):
+            if self._recent[cmd] < limit and query in cmd:
+                return cmd
+        return None
+
+    # ------------------- HELPERS ------------------- #
+    def _push(self, cmd):
+        entries = self.entries
+        if len(entries) == entries.maxlen:
+            self._forget(entries[0])
+        entries.append(cmd)
+        self._counts[cmd] = self._counts.get(cmd, 0) + 1
+        self._recent.pop(cmd, None)
+        self._recent[cmd] = self._next_id
+        self._next_id += 1
+
+    def _forget(self, cmd):
+        """Drops the index entries of a command leaving the ring"""
+        count = self._counts[cmd] - 1
+        if count:
+            self._counts[cmd] = count
+        else:
+            del self._counts[cmd]
+            del self._recent[cmd]
+
+    def _load(self):
+        self._entries = deque(maxlen=self.capacity)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                tail = deque(f, maxlen=self.capacity)
+                size = f.tell()
+        except OSError:
+            return
+        for line in tail:
+            line = line.rstrip('\n')
+            if line:
+                self._push(line)
+        if size > COMPACT_FACTOR * sum(map(len, tail)):
+            self._compact()
+
+    def _compact(self):
+        """Rewrites the history file with only the commands still in the ring"""
+        tmp_path = self.path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(cmd + '\n' for cmd in self._entries)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,97 @@
+import curses
+from configs.config_loader import config
+
+# A resize is applied once no KEY_RESIZE arrived for RESIZE_DEBOUNCE seconds,
+# and at the latest RESIZE_MAX_DELAY seconds after the first one of a burst
+RESIZE_DEBOUNCE = 0.1
+RESIZE_MAX_DELAY = 0.5
+
+
+class LayoutEngine:
+    """
+    Computes the geometry of the game windows from layout.json, once per
+    terminal size, and applies it to existing windows in place so the
+    animation and game drawing into them keep valid references.
+    """
+
+    def __init__(self, debounce: float = RESIZE_DEBOUNCE, max_delay: float = RESIZE_MAX_DELAY):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._geometry = {}
+        self._first_resize = None
+        self.deadline = None  # when the pending resize is applied, None without one
+
+    def geometry(self, max_y: int, max_x: int):
+        """
+        (height, width, y, x) of every window for a terminal size, or None
+        when the windows do not fit in it
+        """
+        size = (max_y, max_x)
+        if size not in self._geometry:
+            geometry = self._compute(config.layout['layout'], max_y, max_x)
+            fits = all(h > 0 and w > 0 and y + h <= max_y and x + w <= max_x
+                       for h, w, y, x in geometry.values())
+            self._geometry[size] = geometry if fits else None
+        return self._geometry[size]
+
+    def apply(self, windows: dict, max_y: int, max_x: int, screen=curses):
+        """
+        Creates missing windows and moves or resizes existing ones to fit
+        the terminal size
+
+        :return: False if the terminal is too small
+        """
+        geometry = self.geometry(max_y, max_x)
+        if geometry is None:
+            return False
+        for name, (h, w, y, x) in geometry.items():
+            win = windows.get(name)
+            if win is None:
+                windows[name] = screen.newwin(h, w, y, x)
+                continue
+            if (win.getmaxyx(), win.getbegyx()) == ((h, w), (y, x)):
+                continue
+            # Shrink before moving, a window must fit the screen where it is moved to
+            old_h, old_w = win.getmaxyx()
+            win.resize(min(h, old_h), min(w, old_w))
+            win.mvwin(y, x)
+            win.resize(h, w)
+        return True
+
+    # ------------------- DEBOUNCE ------------------- #
+    def request_resize(self, now: float):
+        """Records a KEY_RESIZE, postponing the relayout until the burst is over"""
+        if self._first_resize is None:
+            self._first_resize = now
+        self.deadline = min(now + self.debounce, self._first_resize + self.max_delay)
+
+    def resize_due(self, now: float):
+        """True once, when a pending resize should be applied"""
+        if self.deadline is None or now < self.deadline:
+            return False
+        self._first_resize = self.deadline = None
+        return True
+
+    def _compute(self, layout, max_y, max_x):
+        pet_h, pet_w = layout['pet']['height'], layout['pet']['width']
+        history_h = layout['history']['height']
+        status_h = layout['status']['height']
+
+        pet_y = layout['top_margin']
+        history_y = pet_y + pet_h
+        input_y = history_y + history_h
+        status_x = max_x // 2 + 20
+        # A width_ratio of 0 extends the side panels to the right edge
+        status_w = int(max_x * layout['status']['width_ratio']) or max_x - status_x
+
+        return {
+            'pet': (pet_h, pet_w, pet_y, 0),
+            'history': (history_h, max_x, history_y, 0),
+            'input': (layout['input']['height'], max_x, input_y, 0),
+            'status': (status_h, status_w, 0, status_x),
+            'legend': (layout['legend']['height'], status_w, status_h, status_x),
+        }
+
+
+# Global instance used by the resize handler
+layout_engine = LayoutEngine()
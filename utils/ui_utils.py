@@ -1,6 +1,12 @@
 import curses
+import os
+import select
+import sys
+import time
 from games.game import Game
 from configs.config_loader import config
+from render import compositor
+from .layout import layout_engine
 
 # ------------------- UI & RENDER HELPERS ------------------- #
 def display_pet(win, pet):
@@ -20,88 +26,109 @@ def display_pet(win, pet):
     win.noutrefresh()
 
 
+def display_perf(win, profiler, notes=()):
+    """
+    Displays rolling frame timings in place of the pet's status, under
+    notes, lines about the rest of the game like a failed save
+    """
+    win.erase()
+    win.border('|', '|', '=', '=', '+', '+', '+', '+')
+    height, width = win.getmaxyx()
+    win.addstr(0, 2, " PERF (ms) "[:width - 4])
+    # Notes first, the phases can outgrow the window
+    lines = [*notes, f"{'phase':<16}{'p50':>7}{'p95':>7}{'p99':>7}"]
+    for name, p in profiler.summary().items():
+        lines.append(f"{name:<16}{p['p50']:7.2f}{p['p95']:7.2f}{p['p99']:7.2f}")
+    for i, line in enumerate(lines, start=1):
+        if i >= height - 1:
+            break
+        win.addstr(i, 2, line[:width - 3])
+    win.noutrefresh()
+
+
 # ------------------- RESIZE HANDLER ------------------- #
 def handle_resize(stdscr, state):
-    curses.endwin()
-    stdscr.refresh()
-    stdscr.clear()
-
-    max_y, max_x = stdscr.getmaxyx()
-    if max_y < 15 or max_x < 80:
-        stdscr.addstr(0, 0, "Terminal too small! Resize to at least 80x15")
-        stdscr.refresh()
-        stdscr.getch()
-        return
-
-    layout = config.layout['layout']
-    PET_HEIGHT = layout['pet']['height']
-    HISTORY_HEIGHT = layout['history']['height']
-    status_height = layout['status']['height']
-    status_width = layout['status']['width_ratio']
-    
-
-    pet_y = layout['top_margin']
-    history_y = pet_y + PET_HEIGHT
-    status_x = int(max_x // 2 + 20)
-    input_y = history_y + HISTORY_HEIGHT
-
-    state.windows = {
-        'pet': curses.newwin(PET_HEIGHT, layout['pet']['width'], pet_y, 0),
-        'history': curses.newwin(HISTORY_HEIGHT, max_x, history_y, 0),
-        'input': curses.newwin(layout['input']['height'], max_x, input_y, 0),
-        'status': curses.newwin(status_height, status_width, 0, status_x),
-        'legend': curses.newwin(layout['legend']['height'], status_width, status_height, status_x),
-    }
-
-    state.windows['status'].border('|', '|', '=', '=', '+', '+', '+', '+')
-    state.windows['input'].nodelay(True)
-    state.max_y, state.max_x = max_y, max_x
-
-
-def handle_input_window(win, cmd, max_x):
-    """Updates the input line with custom cursor"""
+    """
+    Fits the windows to the terminal size in place, then has the panels
+    and the compositor's actors repaint them
+    """
+    with compositor.lock:
+        curses.update_lines_cols()
+        max_y, max_x = stdscr.getmaxyx()
+        stdscr.clear()
+        stdscr.noutrefresh()
+
+        state.too_small = not layout_engine.apply(state.windows, max_y, max_x)
+        if state.too_small:
+            try:
+                stdscr.addstr(0, 0, "Terminal too small! Resize it to fit the game"[:max_x - 1])
+            except curses.error:
+                pass
+            stdscr.noutrefresh()
+            curses.doupdate()
+            return
+
+        for win in state.windows.values():
+            win.touchwin()
+        state.windows['status'].erase()
+        state.windows['status'].border('|', '|', '=', '=', '+', '+', '+', '+')
+        state.windows['input'].nodelay(True)
+        state.max_y, state.max_x = max_y, max_x
+        compositor.invalidate()
+        state.drawn = {}  # every panel needs a redraw
+
+
+def handle_input_window(win, cmd, max_x, search=None):
+    """Updates the input line with custom cursor, or the reverse search prompt while searching"""
     win.erase()
-    curses.init_pair(55, curses.COLOR_RED, curses.COLOR_BLACK)
-    win.addstr(0, 0, "C:> " + cmd)
-    cursor_pos = len("C:> ") + len(cmd)
-    win.addstr(0, cursor_pos, "_", curses.color_pair(55))
+    prompt = "C:> " if search is None else f"(search)'{search}': "
+    line = (prompt + cmd)[:max_x - 2]
+    win.addstr(0, 0, line)
+    win.addstr(0, len(line), "_", config.palette.ui('cursor'))
     win.noutrefresh()
 
 
-def handle_history(cmd, history, windows, max_x):
+def draw_history(history, windows, max_x):
     """Updates command history window"""
-    
-    history_colors = setup_history_colors()
-    history.append(cmd)
+    history_colors = config.palette.ui('history')
     windows['history'].erase()
-    for i, h in enumerate(history[-5:]):
+    # Newest command on the bottom line, in the brightest shade
+    history = ([''] * 5 + list(history))[-5:]
+    for i, h in enumerate(history):
         if i < 5:
             windows['history'].addstr(i, 0, h[:max_x - 1], history_colors[i])
     windows['history'].noutrefresh()
 
 
-def setup_history_colors():
-    """Sets up color pairs for history and display"""
-    curses.start_color()
-    shades = [curses.COLORS - 20, curses.COLORS - 15,
-              curses.COLORS - 10, curses.COLORS - 5, curses.COLORS - 1]
-    for i, fg in enumerate(shades, start=1):
-        curses.init_pair(i, fg, curses.COLOR_BLACK)
-    return {i - 1: curses.color_pair(i) for i in range(1, 6)}
-
-
 # ------------------- INPUT HELPERS ------------------- #
 def read_key(stdscr, input_win, cmd, current_anim):
-    key = stdscr.getch()
-    if key == -1:
-        try:
-            return input_win.get_wch()
-        except curses.error:
-            return None
+    # getch refreshes the window it reads from, so it must not race the compositor
+    with compositor.lock:
+        key = stdscr.getch()
+        if key == -1:
+            try:
+                return input_win.get_wch()
+            except curses.error:
+                return None
     key, cmd = handle_input(key, cmd, current_anim)
     return key
 
 
+def wait_for_input(timeout):
+    """
+    Blocks until stdin has input or timeout seconds pass, so the main loop
+    sleeps instead of polling while the pet is idle
+    """
+    timeout = max(0.0, timeout)
+    if os.name == 'nt':  # select only works on sockets on Windows
+        time.sleep(min(timeout, 0.01))
+        return
+    try:
+        select.select([sys.stdin], [], [], timeout)
+    except (OSError, ValueError):
+        time.sleep(min(timeout, 0.01))
+
+
 def handle_input(key, cmd, current_anim):
     """Converts curses input into string commands"""
     if isinstance(key, int) and not isinstance(current_anim, Game):
@@ -112,9 +139,12 @@ def handle_input(key, cmd, current_anim):
             key = "\n"
         elif key in (127, 8):
             key = "\x7f"
+        elif key == 18:  # Ctrl-R
+            key = "\x12"
         elif key == 27:
-            key = None
-            cmd = ""
+            key = "\x1b"
+        elif key in (curses.KEY_UP, curses.KEY_DOWN, curses.KEY_RESIZE):
+            pass
         else:
             key = None
     return key, cmd.lower()
\ No newline at end of file